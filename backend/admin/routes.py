@@ -82,17 +82,20 @@ async def admin_users(
 async def admin_signals(
     request: Request,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    before_id: Optional[int] = None
 ):
     """
     Signal management page
     """
     try:
-        signals = await get_db_signals(limit=limit, offset=offset)
+        signals = await get_db_signals(limit=limit, offset=offset, before_id=before_id)
 
         return templates.TemplateResponse("signals.html", {
             "request": request,
             "signals": signals,
+            "limit": limit,
+            "next_cursor": signals[-1]["id"] if len(signals) == limit else None,
             "page": "signals"
         })
     except Exception as e:
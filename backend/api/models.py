@@ -3,7 +3,7 @@ Pydantic Models for API Request/Response Validation
 Matches the Android app data models
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -78,6 +78,14 @@ class ScanRequest(BaseModel):
     crypto_limit: int = Field(30, ge=10, le=100, description="Number of top crypto coins")
     forex_pairs: Optional[List[str]] = None
     
+    @field_validator("market_types", "strategies", "forex_pairs")
+    @classmethod
+    def normalize_names(cls, values: Optional[List[str]]) -> Optional[List[str]]:
+        """Upper-case and de-duplicate, so the scan and its cache key see the same request"""
+        if values is None:
+            return None
+        return list(dict.fromkeys(v.strip().upper() for v in values if v.strip()))
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -186,6 +194,7 @@ class ApiResponse(BaseModel):
     data: Optional[Any] = None
     message: Optional[str] = None
     error: Optional[str] = None
+    next_cursor: Optional[int] = None  # Paged lists: pass back as before_id for the next page
     
     class Config:
         json_schema_extra = {
@@ -3,39 +3,49 @@ API Routes for Trading Signal Backend
 Handles all HTTP endpoints for the Android app
 """
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
+import json
 
 from api.models import (
     ScanRequest, ScanResponse, Signal, ApiResponse,
     Statistics, UserConfig, MarketData
 )
 from services.scanner_service import ScannerService
-from database.db import get_db_signals, save_signals, get_statistics
+from services.signal_hub import signal_hub
+from services.price_feed import PriceFeed, PriceWatcher, position_events
+from database.db import get_db_signals, get_statistics
 
 router = APIRouter()
 scanner = ScannerService()
+price_feed = PriceFeed(scanner)
+
+# Comment line sent on an idle stream so proxies and phones keep the connection open
+SSE_KEEPALIVE_SECONDS = 15
 
 # ==================== SCAN ENDPOINTS ====================
 
 @router.post("/scan/single", response_model=ScanResponse)
-async def perform_single_scan(request: ScanRequest, background_tasks: BackgroundTasks):
+async def perform_single_scan(request: ScanRequest):
     """
     Perform a single scan with specified parameters
     Returns signals found during the scan
+    Identical concurrent requests share one scan, and results are reused until the next candle close
     """
     try:
         print(f"📡 Starting scan: {request.market_types}, strategies: {request.strategies}")
         
-        # Perform scan using the scanner service
-        scan_response = await scanner.perform_scan(request)
-        
-        # Save signals to database in background
-        if scan_response.signals:
-            background_tasks.add_task(save_signals, scan_response.signals)
+        # Perform scan using the scanner service (or reuse a matching one)
+        # A new scan queues its signals for the background DB writer itself
+        scan_response, fresh = await scanner.get_or_scan(request)
         
-        print(f"✅ Scan complete: Found {len(scan_response.signals)} signals")
+        if fresh:
+            print(f"✅ Scan complete: Found {len(scan_response.signals)} signals")
+        else:
+            print(f"♻️  Reused scan result: {len(scan_response.signals)} signals")
         return scan_response
         
     except Exception as e:
@@ -62,22 +72,72 @@ async def get_scan_status():
 @router.get("/signals", response_model=ApiResponse)
 async def get_all_signals(
     limit: Optional[int] = Query(100, ge=1, le=500),
-    offset: Optional[int] = Query(0, ge=0)
+    offset: Optional[int] = Query(0, ge=0),
+    before_id: Optional[int] = Query(None, ge=1)
 ):
     """
     Get all signals with pagination
+    Follow next_cursor (as before_id) for constant-time paging; offset still works
     """
     try:
-        signals = await get_db_signals(limit=limit, offset=offset)
+        signals = await get_db_signals(limit=limit, offset=offset, before_id=before_id)
         return ApiResponse(
             success=True,
             data=signals,
-            message=f"Retrieved {len(signals)} signals"
+            message=f"Retrieved {len(signals)} signals",
+            next_cursor=signals[-1]["id"] if len(signals) == limit else None
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/signals/{signal_id}", response_model=ApiResponse)
+@router.get("/signals/stream")
+async def stream_signals(
+    request: Request,
+    market_type: Optional[str] = None,
+    strategy: Optional[str] = None,
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols, e.g. BTCUSDT,ETHUSDT")
+):
+    """
+    Server-Sent Events stream of signals as soon as they are saved
+    A 'dropped' event means this client fell behind and should re-fetch /signals
+    """
+    if market_type and market_type.upper() not in ["CRYPTO", "FOREX"]:
+        raise HTTPException(status_code=400, detail="Market type must be CRYPTO or FOREX")
+    if strategy and strategy.upper() not in ["SAR_SMA", "SUPERTREND_MA"]:
+        raise HTTPException(status_code=400, detail="Strategy must be SAR_SMA or SUPERTREND_MA")
+    
+    symbol_filter = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else None
+    
+    async def events():
+        subscription = signal_hub.subscribe(
+            market_types=[market_type.upper()] if market_type else None,
+            strategies=[strategy.upper()] if strategy else None,
+            symbols=symbol_filter
+        )
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                signal = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield f"event: dropped\ndata: {json.dumps({'count': dropped})}\n\n"
+                
+                if signal is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"id: {signal.id}\nevent: signal\ndata: {signal.model_dump_json(by_alias=True)}\n\n"
+        finally:
+            signal_hub.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# :int keeps /signals/recent, /signals/followed, ... from being captured as an ID
+@router.get("/signals/{signal_id:int}", response_model=ApiResponse)
 async def get_signal_by_id(signal_id: int):
     """
     Get a specific signal by ID
@@ -98,24 +158,33 @@ async def get_signal_by_id(signal_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/signals/recent", response_model=ApiResponse)
-async def get_recent_signals(hours: int = Query(24, ge=1, le=168)):
+async def get_recent_signals(
+    hours: int = Query(24, ge=1, le=168),
+    limit: int = Query(100, ge=1, le=500),
+    before_id: Optional[int] = Query(None, ge=1)
+):
     """
     Get signals from the last N hours
     """
     try:
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        signals = await scanner.get_signals_since(cutoff_time)
+        signals = await scanner.get_signals_since(cutoff_time, limit=limit, before_id=before_id)
         
         return ApiResponse(
             success=True,
             data=signals,
-            message=f"Retrieved {len(signals)} signals from last {hours} hours"
+            message=f"Retrieved {len(signals)} signals from last {hours} hours",
+            next_cursor=signals[-1].id if len(signals) == limit else None
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/signals/market/{market_type}", response_model=ApiResponse)
-async def get_signals_by_market(market_type: str):
+async def get_signals_by_market(
+    market_type: str,
+    limit: int = Query(100, ge=1, le=500),
+    before_id: Optional[int] = Query(None, ge=1)
+):
     """
     Get signals filtered by market type (CRYPTO or FOREX)
     """
@@ -123,12 +192,15 @@ async def get_signals_by_market(market_type: str):
         if market_type.upper() not in ["CRYPTO", "FOREX"]:
             raise HTTPException(status_code=400, detail="Market type must be CRYPTO or FOREX")
         
-        signals = await scanner.get_signals_by_market(market_type.upper())
+        signals = await scanner.get_signals_by_market(
+            market_type.upper(), limit=limit, before_id=before_id
+        )
         
         return ApiResponse(
             success=True,
             data=signals,
-            message=f"Retrieved {len(signals)} {market_type} signals"
+            message=f"Retrieved {len(signals)} {market_type} signals",
+            next_cursor=signals[-1].id if len(signals) == limit else None
         )
     except HTTPException:
         raise
@@ -136,7 +208,11 @@ async def get_signals_by_market(market_type: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/signals/strategy/{strategy}", response_model=ApiResponse)
-async def get_signals_by_strategy(strategy: str):
+async def get_signals_by_strategy(
+    strategy: str,
+    limit: int = Query(100, ge=1, le=500),
+    before_id: Optional[int] = Query(None, ge=1)
+):
     """
     Get signals filtered by strategy (SAR_SMA or SUPERTREND_MA)
     """
@@ -147,12 +223,15 @@ async def get_signals_by_strategy(strategy: str):
                 detail="Strategy must be SAR_SMA or SUPERTREND_MA"
             )
         
-        signals = await scanner.get_signals_by_strategy(strategy.upper())
+        signals = await scanner.get_signals_by_strategy(
+            strategy.upper(), limit=limit, before_id=before_id
+        )
         
         return ApiResponse(
             success=True,
             data=signals,
-            message=f"Retrieved {len(signals)} {strategy} signals"
+            message=f"Retrieved {len(signals)} {strategy} signals",
+            next_cursor=signals[-1].id if len(signals) == limit else None
         )
     except HTTPException:
         raise
@@ -303,7 +382,7 @@ async def get_followed_signals(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/signals/followed/{followed_id}", response_model=ApiResponse)
+@router.get("/signals/followed/{followed_id:int}", response_model=ApiResponse)
 async def get_followed_signal(
     followed_id: int,
     current_user: dict = Depends(get_current_user_from_token)
@@ -328,7 +407,7 @@ async def get_followed_signal(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.delete("/signals/followed/{followed_id}", response_model=ApiResponse)
+@router.delete("/signals/followed/{followed_id:int}", response_model=ApiResponse)
 async def unfollow_signal(
     followed_id: int,
     exit_reason: str = "MANUAL",
@@ -378,6 +457,132 @@ async def check_opposite_signals(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== LIVE PRICE FEED ====================
+
+@router.websocket("/market/ws")
+async def market_feed(websocket: WebSocket, token: Optional[str] = None):
+    """
+    Live prices over WebSocket
+    Send {"action": "subscribe" | "unsubscribe", "symbols": [...]} to choose symbols
+    With ?token=<jwt> the user's active followed positions are watched as well and
+    TP1/TP2/SL hits arrive as position_event messages ({"action": "reload_positions"} after following more)
+    """
+    user_id = None
+    if token:
+        try:
+            # Same checks as the HTTP endpoints: valid token, existing and active user
+            user_id = (await get_current_user_from_token(token))["user_id"]
+        except HTTPException:
+            await websocket.close(code=1008)
+            return
+    
+    await websocket.accept()
+    settings = scanner.config["price_feed"]
+    watcher = PriceWatcher()
+    positions = {}
+    sent_events = set()
+    send_lock = asyncio.Lock()
+    
+    async def send(payload: dict):
+        async with send_lock:
+            await websocket.send_json(payload)
+    
+    async def watch_limited(symbols: List[str]):
+        """Watch new symbols up to max_symbols_per_client; followed positions count too"""
+        new_symbols = [s for s in symbols if s not in watcher.symbols]
+        room = settings.get("max_symbols_per_client", 50) - len(watcher.symbols)
+        if len(new_symbols) > room:
+            await send({"type": "error", "message": f"Symbol limit reached, ignored {len(new_symbols) - room} symbols"})
+        price_feed.watch(watcher, new_symbols[:max(room, 0)])
+    
+    async def load_positions():
+        positions.clear()
+        for position in await get_user_followed_signals(user_id, active_only=True):
+            positions[position.id] = position
+        try:
+            known, _ = await scanner.split_known_symbols(sorted({p.symbol for p in positions.values()}))
+        except Exception as e:
+            await send({"type": "error", "message": f"Market data unavailable: {e}"})
+            return
+        await watch_limited(known)
+    
+    async def receive_commands():
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                action = message.get("action")
+                symbols = [s.strip().upper() for s in message.get("symbols", []) if s.strip()]
+            except (ValueError, AttributeError, TypeError):
+                await send({"type": "error", "message": "Expected JSON like {\"action\": \"subscribe\", \"symbols\": [...]}"})
+                continue
+            
+            if action == "subscribe":
+                new_symbols = [s for s in symbols if s not in watcher.symbols]
+                try:
+                    # Unknown symbols would make Binance reject the feed's batched ticker request
+                    new_symbols, unknown = await scanner.split_known_symbols(new_symbols)
+                except Exception as e:
+                    await send({"type": "error", "message": f"Market data unavailable: {e}"})
+                    continue
+                if unknown:
+                    await send({"type": "error", "message": f"Unknown symbols ignored: {', '.join(unknown)}"})
+                await watch_limited(new_symbols)
+                await send({"type": "subscribed", "symbols": sorted(watcher.symbols)})
+            elif action == "unsubscribe":
+                price_feed.unwatch(watcher, symbols)
+                await send({"type": "subscribed", "symbols": sorted(watcher.symbols)})
+            elif action == "reload_positions" and user_id is not None:
+                await load_positions()
+                await send({"type": "subscribed", "symbols": sorted(watcher.symbols)})
+            else:
+                await send({"type": "error", "message": f"Unknown action: {action}"})
+    
+    async def send_ticks():
+        while True:
+            for tick in await watcher.next_ticks():
+                if tick.symbol not in watcher.symbols:
+                    continue
+                await send({"type": "tick", "data": tick.model_dump()})
+                
+                for position in positions.values():
+                    if position.symbol != tick.symbol:
+                        continue
+                    for event in position_events(position, tick.price):
+                        # Each level is reported once per connection
+                        if (position.id, event) in sent_events:
+                            continue
+                        sent_events.add((position.id, event))
+                        await send({
+                            "type": "position_event",
+                            "event": event,
+                            "followed_signal_id": position.id,
+                            "symbol": position.symbol,
+                            "signal_type": position.signal_type,
+                            "price": tick.price
+                        })
+            
+            # Ticks arriving meanwhile are coalesced into the next message batch
+            await asyncio.sleep(settings.get("client_throttle_seconds", 1))
+    
+    tasks = []
+    try:
+        if user_id is not None:
+            await load_positions()
+        
+        tasks = [asyncio.create_task(receive_commands()), asyncio.create_task(send_ticks())]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                print(f"⚠️  Price feed connection error: {error}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        price_feed.unwatch(watcher)
+
+
 # ==================== HEALTH CHECK ====================
 
 @router.get("/health")
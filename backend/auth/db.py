@@ -2,18 +2,16 @@
 User Database Operations
 """
 
-import aiosqlite
 from typing import Optional, List
 from datetime import datetime
 from auth.models import UserCreate, UserInDB, User
 from auth.utils import get_password_hash, verify_password
-
-DATABASE_PATH = "trading_signals.db"
+from database.pool import read_connection, write_connection
 
 
 async def init_users_table():
     """Initialize users table in database"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -32,7 +30,7 @@ async def init_users_table():
 
 async def create_user(user: UserCreate) -> User:
     """Create a new user"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         # Check if email already exists
         async with db.execute("SELECT id FROM users WHERE email = ?", (user.email,)) as cursor:
             existing_user = await cursor.fetchone()
@@ -71,8 +69,7 @@ async def create_user(user: UserCreate) -> User:
 
 async def get_user_by_email(email: str) -> Optional[UserInDB]:
     """Get user by email"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM users WHERE email = ?", (email,)) as cursor:
             row = await cursor.fetchone()
             if row:
@@ -91,8 +88,7 @@ async def get_user_by_email(email: str) -> Optional[UserInDB]:
 
 async def get_user_by_id(user_id: int) -> Optional[User]:
     """Get user by ID"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute("SELECT * FROM users WHERE id = ?", (user_id,)) as cursor:
             row = await cursor.fetchone()
             if row:
@@ -120,8 +116,7 @@ async def authenticate_user(email: str, password: str) -> Optional[UserInDB]:
 
 async def get_all_users(limit: int = 100, offset: int = 0) -> List[User]:
     """Get all users (admin only)"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             "SELECT * FROM users ORDER BY created_at DESC LIMIT ? OFFSET ?",
             (limit, offset)
@@ -143,7 +138,7 @@ async def get_all_users(limit: int = 100, offset: int = 0) -> List[User]:
 
 async def update_user_status(user_id: int, is_active: bool) -> bool:
     """Update user active status (admin only)"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute(
             "UPDATE users SET is_active = ? WHERE id = ?",
             (1 if is_active else 0, user_id)
@@ -154,7 +149,7 @@ async def update_user_status(user_id: int, is_active: bool) -> bool:
 
 async def delete_user(user_id: int) -> bool:
     """Delete a user (admin only)"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute("DELETE FROM users WHERE id = ?", (user_id,))
         await db.commit()
         return True
@@ -163,8 +158,7 @@ async def delete_user(user_id: int) -> bool:
 async def change_user_password(user_id: int, old_password: str, new_password: str) -> bool:
     """Change user password"""
     # Get user
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with write_connection() as db:
         async with db.execute("SELECT * FROM users WHERE id = ?", (user_id,)) as cursor:
             row = await cursor.fetchone()
             if not row:
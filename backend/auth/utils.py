@@ -61,7 +61,10 @@ def decode_token(token: str) -> dict:
 
 
 async def get_current_user_from_token(token: str = Depends(oauth2_scheme)):
-    """Get current user from JWT token"""
+    """Get current user from JWT token; the account must still exist and be active"""
+    # auth.db imports this module for password hashing
+    from auth.db import get_user_by_id
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -76,7 +79,17 @@ async def get_current_user_from_token(token: str = Depends(oauth2_scheme)):
         if email is None or user_id is None:
             raise credentials_exception
 
-        return {"email": email, "user_id": user_id}
-
     except JWTError:
         raise credentials_exception
+
+    # A token outlives deleted and deactivated accounts
+    user = await get_user_by_id(user_id)
+    if user is None:
+        raise credentials_exception
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+
+    return {"email": email, "user_id": user_id}
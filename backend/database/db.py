@@ -4,21 +4,65 @@ Simple and portable, no external database server needed
 """
 
 import sqlite3
+import asyncio
 import json
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime
-import aiosqlite
 from api.models import Signal, Statistics
+from database.pool import DB_FILE, init_pool, close_pool, read_connection, write_connection
+from database.followed_signals_db import record_opposite_signals
 
-# Database file
-DB_FILE = "trading_signals.db"
+# Background signal writer: scans enqueue, one task batches them into a single transaction
+WRITER_MAX_BATCH = 500
+_signal_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
 
-# Global connection pool
-_connection = None
+# Direct save tasks started while the writer is not running (the loop keeps only weak references)
+_pending_saves: Set[asyncio.Task] = set()
+
+INSERT_SIGNAL_SQL = """
+    INSERT INTO signals (
+        symbol, market_type, strategy, signal_type,
+        price, tp1, tp2, stop_loss,
+        volume, quote_volume, timestamp, timeframe,
+        accuracy, conditions, all_conditions_met,
+        sma_20, sma_40, sar,
+        ma_value, ma_type, trend, active_band
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# One pass over signals; seeds signal_stats and answers get_statistics if the row is missing
+AGGREGATE_STATS_SQL = """
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(CASE WHEN market_type = 'CRYPTO' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN market_type = 'FOREX' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN signal_type = 'LONG' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN signal_type = 'SHORT' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN strategy = 'SAR_SMA' THEN 1 ELSE 0 END), 0),
+        COALESCE(SUM(CASE WHEN strategy = 'SUPERTREND_MA' THEN 1 ELSE 0 END), 0),
+        (SELECT timestamp FROM signals ORDER BY id DESC LIMIT 1)
+    FROM signals
+"""
+
+UPDATE_STATS_SQL = """
+    UPDATE signal_stats SET
+        total_signals = total_signals + ?,
+        crypto_signals = crypto_signals + ?,
+        forex_signals = forex_signals + ?,
+        long_signals = long_signals + ?,
+        short_signals = short_signals + ?,
+        sar_sma_signals = sar_sma_signals + ?,
+        supertrend_ma_signals = supertrend_ma_signals + ?,
+        last_scan_time = ?
+    WHERE id = 1
+"""
 
 async def init_db():
-    """Initialize database and create tables"""
-    async with aiosqlite.connect(DB_FILE) as db:
+    """Open the shared connection pool, then create tables"""
+    await init_pool(DB_FILE)
+    
+    async with write_connection() as db:
         # Create signals table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS signals (
@@ -67,130 +111,267 @@ async def init_db():
             ON signals(strategy)
         """)
         
+        # Opposite-signal lookups for followed positions: symbol + side, newest first
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_symbol_type_time
+            ON signals(symbol, signal_type, timestamp DESC)
+        """)
+        
+        # Running totals kept in step with signals by save_signals, so statistics never scan the table
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS signal_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_signals INTEGER NOT NULL DEFAULT 0,
+                crypto_signals INTEGER NOT NULL DEFAULT 0,
+                forex_signals INTEGER NOT NULL DEFAULT 0,
+                long_signals INTEGER NOT NULL DEFAULT 0,
+                short_signals INTEGER NOT NULL DEFAULT 0,
+                sar_sma_signals INTEGER NOT NULL DEFAULT 0,
+                supertrend_ma_signals INTEGER NOT NULL DEFAULT 0,
+                last_scan_time TEXT
+            )
+        """)
+        
+        # First start on an existing database: seed the counters from the rows already stored
+        await db.execute(f"""
+            INSERT OR IGNORE INTO signal_stats (
+                id, total_signals, crypto_signals, forex_signals,
+                long_signals, short_signals, sar_sma_signals, supertrend_ma_signals,
+                last_scan_time
+            ) SELECT 1, * FROM ({AGGREGATE_STATS_SQL})
+        """)
+        
         await db.commit()
         print("✅ Database initialized successfully")
 
 async def close_db():
-    """Close database connection"""
-    global _connection
-    if _connection:
-        await _connection.close()
-        _connection = None
+    """Close the shared connection pool"""
+    await close_pool()
+
+def _signal_row(signal: Signal) -> tuple:
+    """INSERT parameters for one signal"""
+    conditions = signal.conditions
+    # Fixed three-key object, no need for a generic json.dumps per row
+    conditions_json = '{"condition_1": %s, "condition_2": %s, "condition_3": %s}' % (
+        json.dumps(conditions.condition_1),
+        json.dumps(conditions.condition_2),
+        json.dumps(conditions.condition_3)
+    )
+    
+    return (
+        signal.symbol, signal.market_type, signal.strategy, signal.signal,
+        signal.price, signal.tp1, signal.tp2, signal.stop_loss,
+        signal.volume, signal.quote_volume, signal.timestamp, signal.timeframe,
+        signal.accuracy, conditions_json, 1 if signal.all_conditions_met else 0,
+        signal.sma_20, signal.sma_40, signal.sar,
+        signal.ma_value, signal.ma_type, signal.trend, signal.active_band
+    )
+
+def _stats_delta(signals: List[Signal]) -> tuple:
+    """UPDATE_STATS_SQL parameters for a batch of new signals"""
+    crypto = forex = long_signals = short_signals = sar_sma = supertrend = 0
+    for signal in signals:
+        if signal.market_type == "CRYPTO":
+            crypto += 1
+        elif signal.market_type == "FOREX":
+            forex += 1
+        if signal.signal == "LONG":
+            long_signals += 1
+        elif signal.signal == "SHORT":
+            short_signals += 1
+        if signal.strategy == "SAR_SMA":
+            sar_sma += 1
+        elif signal.strategy == "SUPERTREND_MA":
+            supertrend += 1
+    
+    return (
+        len(signals), crypto, forex, long_signals, short_signals, sar_sma, supertrend,
+        signals[-1].timestamp
+    )
 
 async def save_signals(signals: List[Signal]):
-    """Save signals to database"""
+    """Save signals to database (one prepared INSERT, counters and opposite-signal matching in one transaction)"""
     if not signals:
         return
     
-    async with aiosqlite.connect(DB_FILE) as db:
-        for signal in signals:
-            # Convert conditions to JSON string
-            conditions_json = json.dumps({
-                "condition_1": signal.conditions.condition_1,
-                "condition_2": signal.conditions.condition_2,
-                "condition_3": signal.conditions.condition_3
-            })
-            
-            await db.execute("""
-                INSERT INTO signals (
-                    symbol, market_type, strategy, signal_type,
-                    price, tp1, tp2, stop_loss,
-                    volume, quote_volume, timestamp, timeframe,
-                    accuracy, conditions, all_conditions_met,
-                    sma_20, sma_40, sar,
-                    ma_value, ma_type, trend, active_band
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal.symbol, signal.market_type, signal.strategy, signal.signal,
-                signal.price, signal.tp1, signal.tp2, signal.stop_loss,
-                signal.volume, signal.quote_volume, signal.timestamp, signal.timeframe,
-                signal.accuracy, conditions_json, 1 if signal.all_conditions_met else 0,
-                signal.sma_20, signal.sma_40, signal.sar,
-                signal.ma_value, signal.ma_type, signal.trend, signal.active_band
-            ))
-        
+    # Build rows before opening the transaction so the write lock is held only for the insert
+    rows = [_signal_row(signal) for signal in signals]
+    delta = _stats_delta(signals)
+    
+    async with write_connection() as db:
+        await db.executemany(INSERT_SIGNAL_SQL, rows)
+        # One writer and AUTOINCREMENT: the batch got consecutive ids ending at last_insert_rowid()
+        async with db.execute("SELECT last_insert_rowid()") as cursor:
+            first_id = (await cursor.fetchone())[0] - len(rows) + 1
+        await db.execute(UPDATE_STATS_SQL, delta)
+        await record_opposite_signals(db, signals, first_id)
         await db.commit()
         print(f"✅ Saved {len(signals)} signals to database")
 
-async def get_db_signals(limit: int = 100, offset: int = 0) -> List[dict]:
-    """Get signals from database"""
-    async with aiosqlite.connect(DB_FILE) as db:
-        db.row_factory = aiosqlite.Row
-        
-        async with db.execute("""
-            SELECT * FROM signals
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        """, (limit, offset)) as cursor:
-            rows = await cursor.fetchall()
-            
-            signals = []
-            for row in rows:
-                signal_dict = dict(row)
-                # Parse conditions JSON
-                if signal_dict.get('conditions'):
-                    signal_dict['conditions'] = json.loads(signal_dict['conditions'])
-                signals.append(signal_dict)
-            
-            return signals
+def queue_signals(signals: List[Signal]):
+    """
+    Hand signals to the background writer without waiting for the database
+    Falls back to a direct save task when the writer is not running
+    """
+    if not signals:
+        return
+    if _signal_queue is None:
+        task = asyncio.get_running_loop().create_task(_save_directly(list(signals)))
+        _pending_saves.add(task)
+        task.add_done_callback(_pending_saves.discard)
+        return
+    _signal_queue.put_nowait(list(signals))
 
-async def get_statistics() -> Statistics:
-    """Get statistics about signals"""
-    async with aiosqlite.connect(DB_FILE) as db:
-        # Total signals
-        async with db.execute("SELECT COUNT(*) FROM signals") as cursor:
-            total = (await cursor.fetchone())[0]
-        
-        # Crypto signals
-        async with db.execute(
-            "SELECT COUNT(*) FROM signals WHERE market_type = 'CRYPTO'"
-        ) as cursor:
-            crypto = (await cursor.fetchone())[0]
-        
-        # Forex signals
-        async with db.execute(
-            "SELECT COUNT(*) FROM signals WHERE market_type = 'FOREX'"
-        ) as cursor:
-            forex = (await cursor.fetchone())[0]
-        
-        # Long signals
-        async with db.execute(
-            "SELECT COUNT(*) FROM signals WHERE signal_type = 'LONG'"
-        ) as cursor:
-            long_signals = (await cursor.fetchone())[0]
+async def _save_directly(signals: List[Signal]):
+    """Fallback save for queue_signals, logging failures like the writer does"""
+    try:
+        await save_signals(signals)
+    except Exception as e:
+        print(f"❌ Error saving {len(signals)} signals: {e}")
+
+async def _signal_writer_loop():
+    """Drain everything queued since the last write into one batch"""
+    while True:
+        batch = await _signal_queue.get()
+        if batch is None:
+            return
         
-        # Short signals
-        async with db.execute(
-            "SELECT COUNT(*) FROM signals WHERE signal_type = 'SHORT'"
-        ) as cursor:
-            short_signals = (await cursor.fetchone())[0]
+        stop = False
+        while len(batch) < WRITER_MAX_BATCH and not _signal_queue.empty():
+            more = _signal_queue.get_nowait()
+            if more is None:
+                stop = True
+                break
+            batch.extend(more)
         
-        # SAR_SMA signals
-        async with db.execute(
-            "SELECT COUNT(*) FROM signals WHERE strategy = 'SAR_SMA'"
-        ) as cursor:
-            sar_sma = (await cursor.fetchone())[0]
+        try:
+            await save_signals(batch)
+        except Exception as e:
+            print(f"❌ Error saving {len(batch)} queued signals: {e}")
         
-        # SUPERTREND_MA signals
+        if stop:
+            return
+
+async def start_signal_writer():
+    """Start the background signal writer"""
+    global _signal_queue, _writer_task
+    if _writer_task is None:
+        _signal_queue = asyncio.Queue()
+        _writer_task = asyncio.create_task(_signal_writer_loop())
+
+async def stop_signal_writer():
+    """Write whatever is still queued, then stop the writer"""
+    global _signal_queue, _writer_task
+    if _writer_task is not None:
+        _signal_queue.put_nowait(None)
+        await _writer_task
+        _signal_queue = None
+        _writer_task = None
+    if _pending_saves:
+        await asyncio.gather(*_pending_saves)
+
+def row_to_signal_dict(row) -> dict:
+    """Signal row as a dict with the conditions JSON parsed (already parsed dicts pass through)"""
+    signal_dict = dict(row)
+    if isinstance(signal_dict.get('conditions'), str):
+        signal_dict['conditions'] = json.loads(signal_dict['conditions'])
+    return signal_dict
+
+async def get_db_signals(
+    limit: int = 100,
+    offset: int = 0,
+    before_id: Optional[int] = None,
+    market_type: Optional[str] = None,
+    strategy: Optional[str] = None,
+    since: Optional[str] = None
+) -> List[dict]:
+    """
+    Get signals from database, newest first, optionally filtered
+    Pass the last id of a page as before_id for the next one: a seek on the primary key,
+    so every page costs the same; offset is kept for older clients and has to skip rows
+    Filters walk idx_market_type / idx_strategy / idx_timestamp; SQLite stores the rowid
+    in every index entry, so (market_type, id) order comes straight from the index
+    """
+    where = []
+    params = []
+    if market_type is not None:
+        where.append("market_type = ?")
+        params.append(market_type)
+    if strategy is not None:
+        where.append("strategy = ?")
+        params.append(strategy)
+    if since is not None:
+        where.append("timestamp >= ?")
+        params.append(since)
+    if before_id is not None:
+        where.append("id < ?")
+        params.append(before_id)
+    
+    query = "SELECT * FROM signals"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    if before_id is None and offset:
+        query += " OFFSET ?"
+        params.append(offset)
+    
+    async with read_connection() as db:
+        async with db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+            return [row_to_signal_dict(row) for row in rows]
+
+def row_to_signal(row) -> Signal:
+    """Signal row, or a dict from row_to_signal_dict, as a Signal model, id included"""
+    signal_dict = row_to_signal_dict(row)
+    signal_dict['signal'] = signal_dict.pop('signal_type')
+    signal_dict['all_conditions_met'] = bool(signal_dict['all_conditions_met'])
+    return Signal(**signal_dict)
+
+async def get_last_signal_id() -> int:
+    """Highest signal id (0 when the table is empty)"""
+    async with read_connection() as db:
+        async with db.execute("SELECT COALESCE(MAX(id), 0) FROM signals") as cursor:
+            return (await cursor.fetchone())[0]
+
+async def get_signals_after(after_id: int, limit: int = 500) -> List[Signal]:
+    """Signals saved after after_id by any worker, oldest first (a seek on the primary key)"""
+    async with read_connection() as db:
         async with db.execute(
-            "SELECT COUNT(*) FROM signals WHERE strategy = 'SUPERTREND_MA'"
+            "SELECT * FROM signals WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
         ) as cursor:
-            supertrend = (await cursor.fetchone())[0]
+            return [row_to_signal(row) for row in await cursor.fetchall()]
+
+async def get_db_signal(signal_id: int) -> Optional[dict]:
+    """Get one signal by ID"""
+    async with read_connection() as db:
+        async with db.execute("SELECT * FROM signals WHERE id = ?", (signal_id,)) as cursor:
+            row = await cursor.fetchone()
+            return row_to_signal_dict(row) if row else None
+
+async def get_statistics() -> Statistics:
+    """Get statistics about signals (one-row read of the maintained counters)"""
+    async with read_connection() as db:
+        async with db.execute("""
+            SELECT total_signals, crypto_signals, forex_signals,
+                   long_signals, short_signals, sar_sma_signals, supertrend_ma_signals,
+                   last_scan_time
+            FROM signal_stats WHERE id = 1
+        """) as cursor:
+            row = await cursor.fetchone()
         
-        # Last scan time
-        async with db.execute(
-            "SELECT timestamp FROM signals ORDER BY created_at DESC LIMIT 1"
-        ) as cursor:
-            result = await cursor.fetchone()
-            last_scan = result[0] if result else None
+        if row is None:
+            # Counters not seeded yet (init_db has not run): aggregate in one pass instead
+            async with db.execute(AGGREGATE_STATS_SQL) as cursor:
+                row = await cursor.fetchone()
         
         return Statistics(
-            total_signals=total,
-            crypto_signals=crypto,
-            forex_signals=forex,
-            long_signals=long_signals,
-            short_signals=short_signals,
-            sar_sma_signals=sar_sma,
-            supertrend_ma_signals=supertrend,
-            last_scan_time=last_scan
+            total_signals=row[0],
+            crypto_signals=row[1],
+            forex_signals=row[2],
+            long_signals=row[3],
+            short_signals=row[4],
+            sar_sma_signals=row[5],
+            supertrend_ma_signals=row[6],
+            last_scan_time=row[7]
         )
\ No newline at end of file
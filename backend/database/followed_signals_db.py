@@ -2,12 +2,18 @@
 Followed Signals Database Operations
 """
 
-import aiosqlite
-from typing import Optional, List
+from typing import Optional, List, Dict, Set, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 
-DATABASE_PATH = "trading_signals.db"
+from database.pool import read_connection, write_connection
+
+# Active positions for matching signals as they are saved, loaded incrementally by id:
+# followed_id -> (symbol, signal_type, started_at), plus symbol -> followed_ids
+_positions: Dict[int, Tuple[str, str, str]] = {}
+_positions_by_symbol: Dict[str, Set[int]] = {}
+_positions_max_id = 0
+_index_enabled = False
 
 
 class FollowedSignalCreate(BaseModel):
@@ -45,11 +51,38 @@ class FollowedSignal(BaseModel):
     opposite_signal_detected: bool = False
     opposite_signal_price: Optional[float] = None
     opposite_signal_time: Optional[str] = None
+    opposite_signal_id: Optional[int] = None
+
+
+def _row_to_followed_signal(row) -> FollowedSignal:
+    """Convert a followed_signals row to FollowedSignal model"""
+    return FollowedSignal(
+        id=row['id'],
+        signal_id=row['signal_id'],
+        user_id=row['user_id'],
+        symbol=row['symbol'],
+        market_type=row['market_type'],
+        strategy=row['strategy'],
+        signal_type=row['signal_type'],
+        entry_price=row['entry_price'],
+        take_profit1=row['take_profit1'],
+        take_profit2=row['take_profit2'],
+        stop_loss=row['stop_loss'],
+        started_at=row['started_at'],
+        is_active=bool(row['is_active']),
+        exited_at=row['exited_at'],
+        exit_reason=row['exit_reason'],
+        exit_price=row['exit_price'],
+        opposite_signal_detected=bool(row['opposite_signal_detected']),
+        opposite_signal_price=row['opposite_signal_price'],
+        opposite_signal_time=row['opposite_signal_time'],
+        opposite_signal_id=row['opposite_signal_id']
+    )
 
 
 async def init_followed_signals_table():
     """Initialize followed_signals table"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute("""
             CREATE TABLE IF NOT EXISTS followed_signals (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -71,6 +104,7 @@ async def init_followed_signals_table():
                 opposite_signal_detected BOOLEAN DEFAULT 0,
                 opposite_signal_price REAL,
                 opposite_signal_time TIMESTAMP,
+                opposite_signal_id INTEGER,
                 FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
             )
         """)
@@ -86,13 +120,23 @@ async def init_followed_signals_table():
             ON followed_signals(is_active)
         """)
 
+        # Tables created before detections linked the signal that triggered them
+        async with db.execute("PRAGMA table_info(followed_signals)") as cursor:
+            columns = [row['name'] for row in await cursor.fetchall()]
+        if 'opposite_signal_id' not in columns:
+            await db.execute("ALTER TABLE followed_signals ADD COLUMN opposite_signal_id INTEGER")
+
         await db.commit()
-        print("✅ Followed signals table initialized")
+
+    # Catch up on signals saved while no worker had the position index loaded
+    await backfill_opposite_signals()
+    enable_opposite_signal_index()
+    print("✅ Followed signals table initialized")
 
 
 async def create_followed_signal(followed: FollowedSignalCreate) -> FollowedSignal:
     """Create a new followed signal"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         cursor = await db.execute("""
             INSERT INTO followed_signals (
                 signal_id, user_id, symbol, market_type, strategy, signal_type,
@@ -129,8 +173,7 @@ async def create_followed_signal(followed: FollowedSignalCreate) -> FollowedSign
 
 async def get_user_followed_signals(user_id: int, active_only: bool = False) -> List[FollowedSignal]:
     """Get all followed signals for a user"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
 
         if active_only:
             query = "SELECT * FROM followed_signals WHERE user_id = ? AND is_active = 1 ORDER BY started_at DESC"
@@ -139,69 +182,23 @@ async def get_user_followed_signals(user_id: int, active_only: bool = False) ->
 
         async with db.execute(query, (user_id,)) as cursor:
             rows = await cursor.fetchall()
-            return [
-                FollowedSignal(
-                    id=row['id'],
-                    signal_id=row['signal_id'],
-                    user_id=row['user_id'],
-                    symbol=row['symbol'],
-                    market_type=row['market_type'],
-                    strategy=row['strategy'],
-                    signal_type=row['signal_type'],
-                    entry_price=row['entry_price'],
-                    take_profit1=row['take_profit1'],
-                    take_profit2=row['take_profit2'],
-                    stop_loss=row['stop_loss'],
-                    started_at=row['started_at'],
-                    is_active=bool(row['is_active']),
-                    exited_at=row['exited_at'],
-                    exit_reason=row['exit_reason'],
-                    exit_price=row['exit_price'],
-                    opposite_signal_detected=bool(row['opposite_signal_detected']),
-                    opposite_signal_price=row['opposite_signal_price'],
-                    opposite_signal_time=row['opposite_signal_time']
-                )
-                for row in rows
-            ]
+            return [_row_to_followed_signal(row) for row in rows]
 
 
 async def get_followed_signal_by_id(followed_id: int, user_id: int) -> Optional[FollowedSignal]:
     """Get a specific followed signal"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
+    async with read_connection() as db:
         async with db.execute(
             "SELECT * FROM followed_signals WHERE id = ? AND user_id = ?",
             (followed_id, user_id)
         ) as cursor:
             row = await cursor.fetchone()
-            if row:
-                return FollowedSignal(
-                    id=row['id'],
-                    signal_id=row['signal_id'],
-                    user_id=row['user_id'],
-                    symbol=row['symbol'],
-                    market_type=row['market_type'],
-                    strategy=row['strategy'],
-                    signal_type=row['signal_type'],
-                    entry_price=row['entry_price'],
-                    take_profit1=row['take_profit1'],
-                    take_profit2=row['take_profit2'],
-                    stop_loss=row['stop_loss'],
-                    started_at=row['started_at'],
-                    is_active=bool(row['is_active']),
-                    exited_at=row['exited_at'],
-                    exit_reason=row['exit_reason'],
-                    exit_price=row['exit_price'],
-                    opposite_signal_detected=bool(row['opposite_signal_detected']),
-                    opposite_signal_price=row['opposite_signal_price'],
-                    opposite_signal_time=row['opposite_signal_time']
-                )
-            return None
+            return _row_to_followed_signal(row) if row else None
 
 
 async def stop_following_signal(followed_id: int, user_id: int, exit_reason: str, exit_price: Optional[float] = None) -> bool:
     """Stop following a signal"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with write_connection() as db:
         await db.execute("""
             UPDATE followed_signals
             SET is_active = 0, exited_at = ?, exit_reason = ?, exit_price = ?
@@ -209,64 +206,164 @@ async def stop_following_signal(followed_id: int, user_id: int, exit_reason: str
         """, (datetime.now().isoformat(), exit_reason, exit_price, followed_id, user_id))
 
         await db.commit()
+        _forget_position(followed_id)
         return True
 
 
-async def mark_opposite_signal_detected(followed_id: int, opposite_price: float) -> bool:
-    """Mark that an opposite signal was detected"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("""
-            UPDATE followed_signals
-            SET opposite_signal_detected = 1,
-                opposite_signal_price = ?,
-                opposite_signal_time = ?
-            WHERE id = ?
-        """, (opposite_price, datetime.now().isoformat(), followed_id))
+def enable_opposite_signal_index():
+    """Start matching saved signals against active positions (needs the followed_signals table)"""
+    global _index_enabled
+    _index_enabled = True
 
-        await db.commit()
-        return True
+
+def _forget_position(followed_id: int):
+    """Drop a position from the in-memory index"""
+    position = _positions.pop(followed_id, None)
+    if position is not None:
+        followers = _positions_by_symbol.get(position[0])
+        if followers is not None:
+            followers.discard(followed_id)
+            if not followers:
+                del _positions_by_symbol[position[0]]
+
+
+async def _load_new_positions(db):
+    """
+    Add positions created since the last load (by any worker) to the index
+    A primary-key seek past the highest id seen, so normally it returns nothing
+    """
+    global _positions_max_id
+    async with db.execute("""
+        SELECT id, symbol, signal_type, started_at FROM followed_signals
+        WHERE id > ? AND is_active = 1
+    """, (_positions_max_id,)) as cursor:
+        rows = await cursor.fetchall()
+
+    for row in rows:
+        _positions[row['id']] = (row['symbol'], row['signal_type'], row['started_at'])
+        _positions_by_symbol.setdefault(row['symbol'], set()).add(row['id'])
+        _positions_max_id = max(_positions_max_id, row['id'])
+
+
+async def _flag_opposite_signals(db, detections: List[tuple]):
+    """Record detections as (followed_id, opposite_price, opposite_signal_id), on an open write connection"""
+    detected_at = datetime.now().isoformat()
+    await db.executemany("""
+        UPDATE followed_signals
+        SET opposite_signal_detected = 1,
+            opposite_signal_price = ?,
+            opposite_signal_time = ?,
+            opposite_signal_id = ?
+        WHERE id = ? AND is_active = 1
+    """, [
+        (price, detected_at, signal_id, followed_id)
+        for followed_id, price, signal_id in detections
+    ])
+
+
+async def record_opposite_signals(db, signals: list, first_id: int) -> List[tuple]:
+    """
+    Match newly inserted signals (ids first_id, first_id + 1, ...) against active positions
+    Runs inside save_signals' transaction; returns (followed_id, opposite_signal_id) pairs
+    """
+    if not _index_enabled:
+        return []
+
+    await _load_new_positions(db)
+
+    # Newest opposite signal per position; later signals in the batch win ties
+    matches: Dict[int, Tuple[str, float, int]] = {}
+    for offset, signal in enumerate(signals):
+        for followed_id in _positions_by_symbol.get(signal.symbol, ()):
+            _, signal_type, started_at = _positions[followed_id]
+            if signal.signal == signal_type or signal.timestamp <= started_at:
+                continue
+            best = matches.get(followed_id)
+            if best is None or signal.timestamp >= best[0]:
+                matches[followed_id] = (signal.timestamp, signal.price, first_id + offset)
+
+    if not matches:
+        return []
+
+    await _flag_opposite_signals(db, [
+        (followed_id, price, signal_id)
+        for followed_id, (_, price, signal_id) in matches.items()
+    ])
+
+    # Positions closed through another worker are still indexed here; drop them now
+    followed_ids = list(matches)
+    placeholders = ", ".join("?" * len(followed_ids))
+    async with db.execute(
+        f"SELECT id FROM followed_signals WHERE id IN ({placeholders}) AND is_active = 0",
+        followed_ids
+    ) as cursor:
+        for row in await cursor.fetchall():
+            _forget_position(row['id'])
+            matches.pop(row['id'], None)
+
+    print(f"🔔 Opposite signals detected on {len(matches)} followed positions")
+    return [(followed_id, signal_id) for followed_id, (_, _, signal_id) in matches.items()]
+
+
+async def backfill_opposite_signals():
+    """
+    Link active positions to the newest opposite signal already stored for them
+    One join over positions without a detection, each an idx_symbol_type_time seek
+    """
+    async with write_connection() as db:
+        async with db.execute("""
+            SELECT f.id, s.price, s.id AS opposite_id
+            FROM followed_signals f
+            JOIN signals s ON s.id = (
+                SELECT id FROM signals
+                WHERE symbol = f.symbol
+                  AND signal_type = CASE f.signal_type WHEN 'LONG' THEN 'SHORT' ELSE 'LONG' END
+                  AND timestamp > f.started_at
+                ORDER BY timestamp DESC
+                LIMIT 1
+            )
+            WHERE f.is_active = 1 AND f.opposite_signal_id IS NULL
+        """) as cursor:
+            rows = await cursor.fetchall()
+
+        if rows:
+            await _flag_opposite_signals(db, [
+                (row['id'], row['price'], row['opposite_id']) for row in rows
+            ])
+            await db.commit()
 
 
 async def check_for_opposite_signals(user_id: int) -> List[dict]:
     """
     Check for opposite signals on user's followed positions
     Returns list of followed signals that have opposite signals
+    Detections are recorded when signals are saved, so this is a plain indexed read
     """
-    from database.db import get_db_signals
+    from database.db import row_to_signal_dict
 
-    # Get user's active followed signals
-    followed = await get_user_followed_signals(user_id, active_only=True)
+    async with read_connection() as db:
+        async with db.execute("""
+            SELECT * FROM followed_signals
+            WHERE user_id = ? AND is_active = 1 AND opposite_signal_id IS NOT NULL
+        """, (user_id,)) as cursor:
+            followed_rows = await cursor.fetchall()
 
-    if not followed:
-        return []
+        if not followed_rows:
+            return []
 
-    # Get recent signals (last 24 hours)
-    recent_signals = await get_db_signals(limit=1000)
-
-    opposite_detections = []
-
-    for fs in followed:
-        # Look for opposite signals for the same symbol
-        for signal in recent_signals:
-            if signal.get('symbol') == fs.symbol:
-                # Check if it's an opposite signal
-                if fs.signal_type == "LONG" and signal.get('signal_type') == "SHORT":
-                    opposite_detections.append({
-                        "followed_signal_id": fs.id,
-                        "followed_signal": fs,
-                        "opposite_signal": signal
-                    })
-                    # Mark as detected
-                    await mark_opposite_signal_detected(fs.id, signal.get('price', 0))
-                    break
-                elif fs.signal_type == "SHORT" and signal.get('signal_type') == "LONG":
-                    opposite_detections.append({
-                        "followed_signal_id": fs.id,
-                        "followed_signal": fs,
-                        "opposite_signal": signal
-                    })
-                    # Mark as detected
-                    await mark_opposite_signal_detected(fs.id, signal.get('price', 0))
-                    break
-
-    return opposite_detections
+        opposite_ids = [row['opposite_signal_id'] for row in followed_rows]
+        placeholders = ", ".join("?" * len(opposite_ids))
+        async with db.execute(
+            f"SELECT * FROM signals WHERE id IN ({placeholders})", opposite_ids
+        ) as cursor:
+            signals = {row['id']: row_to_signal_dict(row) for row in await cursor.fetchall()}
+
+    return [
+        {
+            "followed_signal_id": row['id'],
+            "followed_signal": _row_to_followed_signal(row),
+            "opposite_signal": signals[row['opposite_signal_id']]
+        }
+        for row in followed_rows
+        if row['opposite_signal_id'] in signals
+    ]
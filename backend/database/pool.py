@@ -0,0 +1,177 @@
+"""
+Database Connection Pool - long-lived aiosqlite connections shared by all DB modules
+One writer connection (writes are serialized by SQLite anyway) plus N reader connections
+The database runs in WAL mode so readers never wait on scan writes
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import aiosqlite
+
+# Database file
+DB_FILE = "trading_signals.db"
+
+# Reader connections kept open next to the single writer
+DEFAULT_READERS = 4
+
+# Per-connection settings (WAL itself is persistent and set once by the writer)
+PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",  # Durable at checkpoints; safe with WAL, no fsync per commit
+    "PRAGMA cache_size = -16000",  # ~16 MB page cache per connection
+    "PRAGMA mmap_size = 134217728",  # Read through 128 MB of memory-mapped I/O
+    "PRAGMA busy_timeout = 5000",  # Wait up to 5 s for a lock instead of failing
+    "PRAGMA temp_store = MEMORY"
+)
+
+# Checkpoint the WAL and refresh planner statistics this often
+MAINTENANCE_INTERVAL_SECONDS = 600
+
+
+async def apply_pragmas(conn: aiosqlite.Connection):
+    """Apply the per-connection PRAGMAs"""
+    for pragma in PRAGMAS:
+        await conn.execute(pragma)
+
+
+class ConnectionPool:
+    """
+    Borrow a reader with read(), the writer with write()
+    Borrowing is a queue pop / lock acquire instead of a connect + close per call
+    """
+
+    def __init__(self, path: str = DB_FILE, readers: int = DEFAULT_READERS):
+        self.path = path
+        self.reader_count = readers
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.path)
+        # Row works with both row['column'] and row[0], so callers need no changes
+        conn.row_factory = aiosqlite.Row
+        await apply_pragmas(conn)
+        return conn
+
+    async def open(self):
+        """Open the writer (switching the file to WAL) and the reader connections"""
+        self._writer = await self._connect()
+        async with self._writer.execute("PRAGMA journal_mode = WAL") as cursor:
+            mode = (await cursor.fetchone())[0]
+        if mode.lower() != "wal":
+            print(f"⚠️  SQLite WAL unavailable, journal mode is {mode}")
+
+        for _ in range(self.reader_count):
+            conn = await self._connect()
+            self._readers.append(conn)
+            self._idle.put_nowait(conn)
+
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def maintenance(self):
+        """Fold the WAL back into the database file and refresh query planner statistics"""
+        async with self.write() as conn:
+            await conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            await conn.execute("PRAGMA optimize")
+
+    async def _maintenance_loop(self):
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+            try:
+                await self.maintenance()
+            except Exception as e:
+                print(f"⚠️  Database maintenance failed: {e}")
+
+    @asynccontextmanager
+    async def read(self):
+        """Borrow a reader connection"""
+        conn = await self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def write(self):
+        """Borrow the writer connection exclusively (one transaction at a time)"""
+        async with self._write_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                # Never leave a half-finished transaction on the shared writer
+                await self._writer.rollback()
+                raise
+
+    async def close(self):
+        """Stop maintenance, checkpoint once more and close every connection"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+        if self._writer is not None:
+            try:
+                await self.maintenance()
+            except Exception as e:
+                print(f"⚠️  Database maintenance failed: {e}")
+
+        async with self._write_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        for conn in self._readers:
+            await conn.close()
+        self._readers = []
+        self._idle = asyncio.Queue()
+
+
+# Process-wide pool, opened by init_db() and closed by close_db()
+_pool: Optional[ConnectionPool] = None
+
+
+async def init_pool(path: str = DB_FILE, readers: int = DEFAULT_READERS) -> ConnectionPool:
+    """Open the shared pool (no-op if it is already open)"""
+    global _pool
+    if _pool is None:
+        pool = ConnectionPool(path, readers)
+        await pool.open()
+        _pool = pool
+    return _pool
+
+
+async def close_pool():
+    """Close the shared pool"""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+@asynccontextmanager
+async def _standalone_connection():
+    """Single-use connection for code running without the pool (scripts, tools)"""
+    async with aiosqlite.connect(DB_FILE) as conn:
+        conn.row_factory = aiosqlite.Row
+        await apply_pragmas(conn)
+        yield conn
+
+
+def read_connection():
+    """Connection for queries: a pooled reader, or a one-off connection without the pool"""
+    if _pool is None:
+        return _standalone_connection()
+    return _pool.read()
+
+
+def write_connection():
+    """Connection for writes: the pooled writer, or a one-off connection without the pool"""
+    if _pool is None:
+        return _standalone_connection()
+    return _pool.write()
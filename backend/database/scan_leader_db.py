@@ -0,0 +1,245 @@
+"""
+Scan Leader Database Operations
+Leader lease, scan requests, shared scan results and the market data the leader
+fetches for the other workers in multi-worker deployments
+"""
+
+import time
+from typing import List, Optional
+
+from database.pool import read_connection, write_connection
+
+
+async def init_scan_leader_tables():
+    """Initialize scan_leader and scan_results tables"""
+    async with write_connection() as db:
+        # One row: the worker currently allowed to run scheduled scans
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS scan_leader (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                owner TEXT NOT NULL,
+                heartbeat REAL NOT NULL
+            )
+        """)
+
+        # Latest ScanResponse per scan key, readable by every worker
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS scan_results (
+                scan_key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+        # Scans a follower worker needs; the leader runs them and answers in scan_results
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS scan_requests (
+                scan_key TEXT PRIMARY KEY,
+                request TEXT NOT NULL,
+                requested_at REAL NOT NULL
+            )
+        """)
+
+        # Latest full 24h ticker payload; wanted_at is stamped by followers reading it
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS shared_tickers (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                wanted_at REAL NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Symbols each follower's WebSocket clients watch, renewed every price poll
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS price_watches (
+                owner TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (owner, symbol)
+            )
+        """)
+
+        # Latest live MarketData per watched symbol, written by the leader's price poller
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS live_prices (
+                symbol TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+        await db.commit()
+
+
+async def acquire_scan_lease(owner: str, lease_seconds: float) -> bool:
+    """
+    Take or renew the leader lease
+    Succeeds when the lease is free, already ours, or its holder stopped heartbeating
+    """
+    now = time.time()
+    async with write_connection() as db:
+        await db.execute("""
+            INSERT INTO scan_leader (id, owner, heartbeat) VALUES (1, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET owner = excluded.owner, heartbeat = excluded.heartbeat
+            WHERE scan_leader.owner = excluded.owner OR scan_leader.heartbeat < ?
+        """, (owner, now, now - lease_seconds))
+        await db.commit()
+
+        async with db.execute("SELECT owner FROM scan_leader WHERE id = 1") as cursor:
+            row = await cursor.fetchone()
+            return row is not None and row[0] == owner
+
+
+async def release_scan_lease(owner: str):
+    """Give up the lease so another worker can take over immediately"""
+    async with write_connection() as db:
+        await db.execute("DELETE FROM scan_leader WHERE id = 1 AND owner = ?", (owner,))
+        await db.commit()
+
+
+async def save_scan_result(scan_key: str, response_json: str, expires_at: float):
+    """Store a scan response for other workers, dropping expired ones"""
+    async with write_connection() as db:
+        await db.execute("DELETE FROM scan_results WHERE expires_at < ?", (time.time(),))
+        await db.execute("""
+            INSERT OR REPLACE INTO scan_results (scan_key, response, expires_at)
+            VALUES (?, ?, ?)
+        """, (scan_key, response_json, expires_at))
+        await db.commit()
+
+
+async def get_scan_result(scan_key: str) -> Optional[tuple]:
+    """(response_json, expires_at) for a scan key if it has not expired"""
+    async with read_connection() as db:
+        async with db.execute("""
+            SELECT response, expires_at FROM scan_results
+            WHERE scan_key = ? AND expires_at > ?
+        """, (scan_key, time.time())) as cursor:
+            row = await cursor.fetchone()
+            return (row[0], row[1]) if row else None
+
+
+async def request_scan(scan_key: str, request_json: str):
+    """Ask the leader to run a scan (a pending identical request is kept as is)"""
+    async with write_connection() as db:
+        await db.execute("""
+            INSERT OR IGNORE INTO scan_requests (scan_key, request, requested_at)
+            VALUES (?, ?, ?)
+        """, (scan_key, request_json, time.time()))
+        await db.commit()
+
+
+async def get_scan_requests(max_age: float) -> List[tuple]:
+    """
+    (scan_key, request_json) of pending scan requests, dropping ones older than max_age
+    Polled by the leader every fraction of a second: reads only, and takes the write lock
+    just when there is something stale to delete
+    """
+    cutoff = time.time() - max_age
+    async with read_connection() as db:
+        async with db.execute(
+            "SELECT scan_key, request, requested_at FROM scan_requests ORDER BY requested_at"
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+    if any(row[2] < cutoff for row in rows):
+        async with write_connection() as db:
+            await db.execute("DELETE FROM scan_requests WHERE requested_at < ?", (cutoff,))
+            await db.commit()
+
+    return [(row[0], row[1]) for row in rows if row[2] >= cutoff]
+
+
+async def delete_scan_request(scan_key: str):
+    """Remove a scan request once its result has been shared"""
+    async with write_connection() as db:
+        await db.execute("DELETE FROM scan_requests WHERE scan_key = ?", (scan_key,))
+        await db.commit()
+
+
+async def save_shared_tickers(payload_json: str, fetched_at: float):
+    """Publish the leader's latest 24h ticker payload"""
+    async with write_connection() as db:
+        await db.execute("""
+            INSERT INTO shared_tickers (id, payload, fetched_at) VALUES (1, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET payload = excluded.payload, fetched_at = excluded.fetched_at
+        """, (payload_json, fetched_at))
+        await db.commit()
+
+
+async def get_shared_tickers(newer_than: float = 0) -> Optional[tuple]:
+    """
+    (payload_json, fetched_at) if the shared payload is newer than newer_than
+    Stamps wanted_at so the leader keeps the payload fresh while followers read it
+    """
+    async with write_connection() as db:
+        # Placeholder row (fetched_at 0) until the leader's first payload
+        await db.execute("""
+            INSERT INTO shared_tickers (id, payload, fetched_at, wanted_at) VALUES (1, '', 0, ?)
+            ON CONFLICT(id) DO UPDATE SET wanted_at = excluded.wanted_at
+        """, (time.time(),))
+        await db.commit()
+
+        async with db.execute("""
+            SELECT payload, fetched_at FROM shared_tickers WHERE id = 1 AND fetched_at > ?
+        """, (newer_than,)) as cursor:
+            row = await cursor.fetchone()
+            return (row[0], row[1]) if row else None
+
+
+async def get_tickers_wanted_at() -> float:
+    """When a follower last asked for the shared ticker payload (0 if never)"""
+    async with read_connection() as db:
+        async with db.execute("SELECT wanted_at FROM shared_tickers WHERE id = 1") as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else 0.0
+
+
+async def watch_prices(owner: str, symbols: List[str], expires_at: float):
+    """Replace a follower's watched symbols; they lapse at expires_at unless renewed"""
+    async with write_connection() as db:
+        await db.execute("DELETE FROM price_watches WHERE owner = ?", (owner,))
+        await db.executemany(
+            "INSERT INTO price_watches (owner, symbol, expires_at) VALUES (?, ?, ?)",
+            [(owner, symbol, expires_at) for symbol in symbols]
+        )
+        await db.commit()
+
+
+async def get_watched_prices() -> List[str]:
+    """Symbols any follower currently watches, dropping lapsed watches (written only when some lapsed)"""
+    now = time.time()
+    async with read_connection() as db:
+        async with db.execute("SELECT symbol, expires_at FROM price_watches") as cursor:
+            rows = await cursor.fetchall()
+
+    if any(row[1] < now for row in rows):
+        async with write_connection() as db:
+            await db.execute("DELETE FROM price_watches WHERE expires_at < ?", (now,))
+            await db.commit()
+
+    return sorted({row[0] for row in rows if row[1] >= now})
+
+
+async def save_live_prices(prices: List[tuple], max_age: float):
+    """Store (symbol, market_data_json) rows and drop prices nobody refreshed within max_age"""
+    now = time.time()
+    async with write_connection() as db:
+        await db.executemany("""
+            INSERT OR REPLACE INTO live_prices (symbol, data, updated_at) VALUES (?, ?, ?)
+        """, [(symbol, data, now) for symbol, data in prices])
+        await db.execute("DELETE FROM live_prices WHERE updated_at < ?", (now - max_age,))
+        await db.commit()
+
+
+async def get_live_prices(symbols: List[str]) -> List[str]:
+    """MarketData JSON the leader stored for these symbols"""
+    if not symbols:
+        return []
+    placeholders = ",".join("?" * len(symbols))
+    async with read_connection() as db:
+        async with db.execute(
+            f"SELECT data FROM live_prices WHERE symbol IN ({placeholders})", symbols
+        ) as cursor:
+            return [row[0] for row in await cursor.fetchall()]
@@ -0,0 +1,260 @@
+"""
+Indicator Kernels - NumPy implementations of the screener indicators
+Work on raw float64 arrays: one symbol (1-D, bars) or many symbols (2-D, symbols x bars)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+
+
+def as_matrix(values) -> np.ndarray:
+    """Return values as a contiguous 2-D float64 array (symbols x bars)"""
+    return np.ascontiguousarray(np.atleast_2d(np.asarray(values, dtype=np.float64)))
+
+
+def _restore_shape(matrix: np.ndarray, ndim: int) -> np.ndarray:
+    """Return a 1-D row when the caller passed a single symbol"""
+    return matrix[0] if ndim == 1 else matrix
+
+
+# ===============================
+# MOVING AVERAGES & ATR
+# ===============================
+
+def moving_average(close: np.ndarray, ma_type: str, length: int) -> np.ndarray:
+    """
+    SMA or EMA along the bar axis
+    Uses the same pandas rolling/ewm routines as the screener, one column per symbol
+    """
+    matrix = as_matrix(close)
+    frame = pd.DataFrame(matrix.T)
+
+    if ma_type == "SMA":
+        ma = frame.rolling(window=length, min_periods=length).mean()
+    else:  # EMA is the default
+        ma = frame.ewm(span=length, adjust=False).mean()
+
+    return _restore_shape(np.ascontiguousarray(ma.to_numpy().T), np.ndim(close))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range, first bar falls back to high - low"""
+    high, low, close = as_matrix(high), as_matrix(low), as_matrix(close)
+
+    prev_close = np.full_like(close, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+
+    tr = np.fmax(high - low, np.abs(high - prev_close))
+    return np.fmax(tr, np.abs(low - prev_close))
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range (rolling mean of the true range)"""
+    tr = true_range(high, low, close)
+    atr = pd.DataFrame(tr.T).rolling(window=period, min_periods=period).mean()
+    return _restore_shape(np.ascontiguousarray(atr.to_numpy().T), np.ndim(close))
+
+
+# ===============================
+# SUPERTREND MA
+# ===============================
+
+def supertrend_bands(close: np.ndarray, up: np.ndarray, dn: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Ratchet the raw up/down bands and derive the trend
+    The loop runs over bars only; every step is vectorised across symbols
+    Returns (trend, final_up, final_dn) with the same shape as close
+    """
+    ndim = np.ndim(close)
+    close, up, dn = as_matrix(close), as_matrix(up), as_matrix(dn)
+    n_symbols, n_bars = close.shape
+
+    trend = np.ones((n_symbols, n_bars), dtype=np.int64)
+    final_up = np.full((n_symbols, n_bars), np.nan)
+    final_dn = np.full((n_symbols, n_bars), np.nan)
+
+    up_ok = ~np.isnan(up)
+    dn_ok = ~np.isnan(dn)
+
+    for i in range(1, n_bars):
+        prev_close = close[:, i - 1]
+
+        # Update up band
+        prev_up = final_up[:, i - 1]
+        prev_up_ok = ~np.isnan(prev_up)
+        keep_up = ~prev_up_ok | (prev_close > prev_up)
+        ratchet_up = np.where(prev_up_ok, np.maximum(up[:, i], prev_up), up[:, i])
+        final_up[:, i] = np.where(
+            up_ok[:, i] & up_ok[:, i - 1],
+            np.where(keep_up, ratchet_up, up[:, i]),
+            np.where(up_ok[:, i], up[:, i], prev_up)
+        )
+
+        # Update down band
+        prev_dn = final_dn[:, i - 1]
+        prev_dn_ok = ~np.isnan(prev_dn)
+        keep_dn = ~prev_dn_ok | (prev_close < prev_dn)
+        ratchet_dn = np.where(prev_dn_ok, np.minimum(dn[:, i], prev_dn), dn[:, i])
+        final_dn[:, i] = np.where(
+            dn_ok[:, i] & dn_ok[:, i - 1],
+            np.where(keep_dn, ratchet_dn, dn[:, i]),
+            np.where(dn_ok[:, i], dn[:, i], prev_dn)
+        )
+
+        # Determine trend
+        price = close[:, i]
+        trend[:, i] = np.where(
+            trend[:, i - 1] == -1,
+            np.where(price > final_dn[:, i], 1, -1),
+            np.where(price < final_up[:, i], -1, 1)
+        )
+
+    return (
+        _restore_shape(trend, ndim),
+        _restore_shape(final_up, ndim),
+        _restore_shape(final_dn, ndim)
+    )
+
+
+def supertrend_ma(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  ma_type: str = "EMA", ma_length: int = 100, atr_period: int = 10,
+                  atr_multiplier: float = 0.5) -> Dict[str, np.ndarray]:
+    """
+    SuperTrended Moving Average for one symbol (1-D) or a symbols x bars matrix (2-D)
+    Returns trend, up_band, dn_band and ma arrays shaped like close
+    """
+    ma = moving_average(close, ma_type, ma_length)
+    atr = average_true_range(high, low, close, atr_period)
+
+    up = ma - atr_multiplier * atr
+    dn = ma + atr_multiplier * atr
+
+    trend, final_up, final_dn = supertrend_bands(close, up, dn)
+
+    return {
+        'trend': trend,
+        'up_band': final_up,
+        'dn_band': final_dn,
+        'ma': ma
+    }
+
+
+# ===============================
+# PARABOLIC SAR
+# ===============================
+
+def parabolic_sar(high: np.ndarray, low: np.ndarray, af_start: float = 0.02,
+                  af_increment: float = 0.02, af_max: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parabolic SAR for one symbol (1-D) or a symbols x bars matrix (2-D)
+    The loop runs over bars only; every step is vectorised across symbols
+    Returns (sar, trend) shaped like high, trend is 1 (up) or -1 (down)
+    """
+    ndim = np.ndim(high)
+    high, low = as_matrix(high), as_matrix(low)
+    n_symbols, n_bars = high.shape
+
+    sar = np.zeros((n_symbols, n_bars))
+    trend = np.zeros((n_symbols, n_bars))
+    af = np.zeros((n_symbols, n_bars))
+    ep = np.zeros((n_symbols, n_bars))
+
+    if n_bars == 0:
+        return _restore_shape(sar, ndim), _restore_shape(trend, ndim)
+
+    if n_symbols == 1:
+        # Plain floats beat 1-wide array ops for a single symbol
+        _parabolic_sar_row(high[0].tolist(), low[0].tolist(), sar[0], trend[0], af_start, af_increment, af_max)
+        return _restore_shape(sar, ndim), _restore_shape(trend, ndim)
+
+    # Initialize
+    sar[:, 0] = low[:, 0]
+    trend[:, 0] = 1
+    af[:, 0] = af_start
+    ep[:, 0] = high[:, 0]
+
+    for i in range(1, n_bars):
+        uptrend = trend[:, i - 1] == 1
+        projected = sar[:, i - 1] + af[:, i - 1] * (ep[:, i - 1] - sar[:, i - 1])
+
+        # SAR may not move inside the previous one or two bars
+        if i >= 2:
+            floor = np.minimum(projected, np.minimum(low[:, i - 1], low[:, i - 2]))
+            ceiling = np.maximum(projected, np.maximum(high[:, i - 1], high[:, i - 2]))
+        else:
+            floor = np.minimum(projected, low[:, i - 1])
+            ceiling = np.maximum(projected, high[:, i - 1])
+        current = np.where(uptrend, floor, ceiling)
+
+        reversal = np.where(uptrend, low[:, i] <= current, high[:, i] >= current)
+        new_extreme = np.where(uptrend, high[:, i] > ep[:, i - 1], low[:, i] < ep[:, i - 1])
+        stepped_af = np.minimum(af[:, i - 1] + af_increment, af_max)
+
+        sar[:, i] = np.where(reversal, ep[:, i - 1], current)
+        trend[:, i] = np.where(reversal, -trend[:, i - 1], trend[:, i - 1])
+        ep[:, i] = np.where(
+            reversal | new_extreme,
+            np.where(uptrend, np.where(reversal, low[:, i], high[:, i]),
+                     np.where(reversal, high[:, i], low[:, i])),
+            ep[:, i - 1]
+        )
+        af[:, i] = np.where(reversal, af_start, np.where(new_extreme, stepped_af, af[:, i - 1]))
+
+    return _restore_shape(sar, ndim), _restore_shape(trend, ndim)
+
+
+def _parabolic_sar_row(high: list, low: list, sar_out: np.ndarray, trend_out: np.ndarray,
+                       af_start: float, af_increment: float, af_max: float) -> None:
+    """Scalar Parabolic SAR for a single symbol, fills sar_out and trend_out"""
+    length = len(high)
+    sar = [0.0] * length
+    trend = [0.0] * length
+
+    # Initialize
+    sar[0] = low[0]
+    trend[0] = 1.0
+    af = af_start
+    ep = high[0]
+
+    for i in range(1, length):
+        current = sar[i-1] + af * (ep - sar[i-1])
+
+        if trend[i-1] == 1:  # Uptrend
+            if i >= 2:
+                current = min(current, low[i-1], low[i-2])
+            else:
+                current = min(current, low[i-1])
+
+            if low[i] <= current:
+                trend[i] = -1.0
+                current = ep
+                ep = low[i]
+                af = af_start
+            else:
+                trend[i] = 1.0
+                if high[i] > ep:
+                    ep = high[i]
+                    af = min(af + af_increment, af_max)
+
+        else:  # Downtrend
+            if i >= 2:
+                current = max(current, high[i-1], high[i-2])
+            else:
+                current = max(current, high[i-1])
+
+            if high[i] >= current:
+                trend[i] = 1.0
+                current = ep
+                ep = high[i]
+                af = af_start
+            else:
+                trend[i] = -1.0
+                if low[i] < ep:
+                    ep = low[i]
+                    af = min(af + af_increment, af_max)
+
+        sar[i] = current
+
+    sar_out[:] = sar
+    trend_out[:] = trend
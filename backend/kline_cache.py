@@ -0,0 +1,110 @@
+"""
+Kline Cache - keeps closed Binance candles between scans
+Later scans only download candles newer than the last cached close_time (Binance startTime)
+Also holds the streaming indicator state built from those candles
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# Candle length per Binance interval
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000
+}
+
+
+class KlineCache:
+    """
+    Closed candles keyed by (symbol, market_type, timeframe)
+    The last row of every Binance response is the forming candle; it is returned
+    to the caller but never cached, so cached rows are always final
+    """
+
+    def __init__(self, max_bars: int = 1000):
+        self.max_bars = max_bars
+        self._entries: Dict[Tuple[str, str, str], pd.DataFrame] = {}
+        self._states: Dict[Tuple[str, str, str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def start_time(self, symbol: str, market_type: str, interval: str, limit: int) -> Optional[int]:
+        """
+        Binance startTime for an incremental fetch of `limit` candles
+        None means the cache cannot serve this request and a full download is needed
+        """
+        interval_ms = INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            return None
+
+        with self._lock:
+            closed = self._entries.get((symbol, market_type, interval))
+            if closed is None or len(closed) < limit - 1:
+                return None
+            last_close = int(closed['close_time'].iloc[-1])
+
+        # Candles after the cached ones, including the forming candle, must fit in one response
+        missing = (int(time.time() * 1000) - last_close) // interval_ms + 1
+        if missing >= limit:
+            return None
+        return last_close + 1
+
+    def merge(self, symbol: str, market_type: str, interval: str,
+              fresh: pd.DataFrame, limit: int, incremental: bool) -> pd.DataFrame:
+        """
+        Merge a response into the cache and return the latest `limit` candles
+        An incremental response (fetched with start_time) extends the cached candles;
+        a full download replaces them so the entry stays contiguous
+        """
+        key = (symbol, market_type, interval)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if len(fresh) == 0:
+                # Nothing new: serve the cached candles rather than an empty frame
+                if incremental and cached is not None:
+                    return cached.tail(limit).reset_index(drop=True)
+                return fresh.reset_index(drop=True)
+
+            if incremental and cached is not None:
+                combined = pd.concat([cached, fresh], ignore_index=True)
+                combined = combined.drop_duplicates(subset='timestamp', keep='last')
+                combined = combined.sort_values('timestamp').reset_index(drop=True)
+            else:
+                combined = fresh.reset_index(drop=True)
+
+            self._entries[key] = combined.iloc[:-1].tail(self.max_bars).reset_index(drop=True)
+
+        return combined.tail(limit).reset_index(drop=True)
+
+    def get_state(self, symbol: str, market_type: str, interval: str, strategy: str):
+        """Streaming indicator state for a strategy, None if not built yet"""
+        with self._lock:
+            return self._states.get((symbol, market_type, interval, strategy))
+
+    def set_state(self, symbol: str, market_type: str, interval: str, strategy: str, state):
+        """Store streaming indicator state for a strategy"""
+        with self._lock:
+            self._states[(symbol, market_type, interval, strategy)] = state
+
+    def clear(self):
+        """Drop every cached candle and indicator state"""
+        with self._lock:
+            self._entries.clear()
+            self._states.clear()
+
+
+# Shared by the synchronous screener and the async client
+kline_cache = KlineCache()
@@ -10,18 +10,18 @@ from contextlib import asynccontextmanager
 import uvicorn
 import socket
 
-from api.routes import router
+from api.routes import router, scanner as scanner_service, price_feed
+from services.signal_hub import signal_hub
+from services.scan_scheduler import ScanScheduler
+from services.scan_leader import ScanLeader
 from auth.routes import router as auth_router
 from admin.routes import router as admin_router
-from database.db import init_db, close_db
+from database.db import init_db, close_db, start_signal_writer, stop_signal_writer
 from auth.db import init_users_table
 from database.followed_signals_db import init_followed_signals_table
-from services.scanner_service import ScannerService
+from database.scan_leader_db import init_scan_leader_tables
 from fastapi.staticfiles import StaticFiles
 
-# Initialize scanner service
-scanner_service = ScannerService()
-
 def get_local_ip():
     """Get local IP address for network access"""
     try:
@@ -34,6 +34,15 @@ def get_local_ip():
     except Exception:
         return "Unable to detect"
 
+# Background scans on candle close (enabled with scanning.auto_scan_enabled)
+# With several uvicorn workers only the lease holder runs them (and every other scan)
+scan_leader = ScanLeader()
+scanner_service.leader = scan_leader
+# Market data is fetched upstream by the leader too and shared with the other workers
+scanner_service.tickers.leader = scan_leader
+price_feed.leader = scan_leader
+scan_scheduler = ScanScheduler(scanner_service, leader=scan_leader)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -57,10 +66,18 @@ async def lifespan(app: FastAPI):
     await init_db()
     await init_users_table()
     await init_followed_signals_table()
+    await init_scan_leader_tables()
+    await start_signal_writer()
     print("✅ Database initialized successfully")
     
     print("\n🎯 Starting scanner service...")
+    scan_leader.start()
+    scan_scheduler.start()
+    scanner_service.tickers.start()
+    price_feed.start()
     print("✅ Scanner service ready")
+    if scan_scheduler.enabled:
+        print(f"⏰ Auto scan: {', '.join(scan_scheduler.timeframes())} (on candle close)")
     
     print("\n" + "="*80)
     print("✅ API IS READY TO ACCEPT REQUESTS")
@@ -70,6 +87,13 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("\n🛑 Shutting down Trading Signal API...")
+    await scan_scheduler.stop()
+    await scan_leader.stop()
+    await price_feed.stop()
+    await signal_hub.stop()
+    await scanner_service.tickers.stop()
+    await scanner_service.close()
+    await stop_signal_writer()
     await close_db()
     print("✅ Shutdown complete")
 
@@ -0,0 +1,137 @@
+"""
+Rate Limiter - Thread-safe token bucket shared by concurrent scan workers
+Keeps the overall request rate inside a budget no matter how many threads or coroutines are scanning
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket: refills `rate` tokens per second up to `capacity`
+    acquire() blocks until the requested tokens are available
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add tokens earned since the last update (lock must be held)"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens now and return how long the caller must wait before using them
+        The balance may go negative, which queues later callers behind this one
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1):
+        """Block until `tokens` may be spent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """Wait without blocking the event loop until `tokens` may be spent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class BinanceWeightLimiter(TokenBucket):
+    """
+    Token bucket denominated in Binance request weight
+    Tracks the X-MBX-USED-WEIGHT-1M header and backs off on HTTP 429/418
+    """
+
+    # Request weight per endpoint (Binance spot REST API)
+    ENDPOINT_WEIGHTS = {
+        "klines": 2,
+        "ticker/24hr": 2,
+        "ticker/price": 2,
+        "exchangeInfo": 20
+    }
+    # Weight when the endpoint is called without a symbol (all markets)
+    ALL_SYMBOLS_WEIGHTS = {
+        "ticker/24hr": 80,
+        "ticker/price": 4
+    }
+
+    def __init__(self, weight_per_minute: int = 6000, safety_factor: float = 0.8):
+        budget = weight_per_minute * safety_factor
+        super().__init__(rate=budget / 60.0, capacity=budget)
+        self.weight_per_minute = weight_per_minute
+        self._blocked_until = 0.0
+
+    def weight_for(self, endpoint: str, params: dict = None) -> int:
+        """Request weight for an endpoint call"""
+        params = params or {}
+        if params.get("symbols"):
+            # symbols='["BTCUSDT","ETHUSDT"]': ticker/24hr is priced by the number of symbols
+            count = params["symbols"].count(",") + 1
+            if endpoint == "ticker/24hr":
+                return 2 if count <= 20 else 40 if count <= 100 else 80
+            return self.ALL_SYMBOLS_WEIGHTS.get(endpoint, self.ENDPOINT_WEIGHTS.get(endpoint, 1))
+        if endpoint in self.ALL_SYMBOLS_WEIGHTS and not params.get("symbol"):
+            return self.ALL_SYMBOLS_WEIGHTS[endpoint]
+        return self.ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Like TokenBucket.reserve, but also waits out any 429/418 back-off"""
+        wait = super().reserve(tokens)
+        with self._lock:
+            blocked_for = self._blocked_until - time.monotonic()
+        return max(wait, blocked_for)
+
+    def acquire_endpoint(self, endpoint: str, params: dict = None):
+        """Block until a call to `endpoint` fits in the weight budget"""
+        self.acquire(self.weight_for(endpoint, params))
+
+    async def acquire_endpoint_async(self, endpoint: str, params: dict = None):
+        """Async variant of acquire_endpoint for the asyncio client"""
+        await self.acquire_async(self.weight_for(endpoint, params))
+
+    def update_from_response(self, response):
+        """Sync the bucket with the weight Binance reports, back off when rate limited"""
+        headers = response.headers
+        used = headers.get("X-MBX-USED-WEIGHT-1M")
+
+        with self._lock:
+            if used is not None:
+                try:
+                    # Never assume more headroom than the server says is left this minute
+                    remaining = self.capacity - int(used)
+                    self._refill(time.monotonic())
+                    self._tokens = min(self._tokens, remaining)
+                except ValueError:
+                    pass
+
+            if response.status_code in (418, 429):
+                default_backoff = 120 if response.status_code == 418 else 60
+                try:
+                    retry_after = float(headers.get("Retry-After", default_backoff))
+                except ValueError:
+                    retry_after = default_backoff
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                print(f"⚠️  Binance rate limit hit (HTTP {response.status_code}), backing off {retry_after:.0f}s")
+
+
+# Shared by every screener instance in the process
+binance_limiter = BinanceWeightLimiter()
+
+# yfinance has no published limits; keep forex requests to a gentle pace
+yahoo_limiter = TokenBucket(rate=6, capacity=3)
@@ -0,0 +1,72 @@
+"""
+Scan Config - Immutable settings for one scan
+Built from the screener config (plus request overrides) and passed down to every
+fetch and strategy check, so concurrent scans never share mutable state
+"""
+
+from dataclasses import dataclass, field, asdict, replace
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class SarSmaParams:
+    """SAR + SMA strategy parameters"""
+    sar_start: float = 0.02
+    sar_increment: float = 0.02
+    sar_max: float = 0.2
+    sma_fast: int = 20
+    sma_slow: int = 40
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class SuperTrendParams:
+    """SuperTrended Moving Average strategy parameters"""
+    ma_type: str = "EMA"
+    ma_length: int = 100
+    atr_period: int = 10
+    atr_multiplier: float = 0.5
+    change_atr: bool = True
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ScanConfig:
+    """Everything a scan reads while fetching candles and evaluating strategies"""
+    timeframe: str = "5m"
+    cache_klines: bool = True
+    incremental_indicators: bool = False
+    sar_sma: SarSmaParams = field(default_factory=SarSmaParams)
+    supertrend_ma: SuperTrendParams = field(default_factory=SuperTrendParams)
+
+    @classmethod
+    def from_config(cls, config: Dict, **overrides) -> "ScanConfig":
+        """Snapshot of a screener config dict; keyword overrides win (e.g. timeframe from a request)"""
+        scanning = config["scanning"]
+        sar_sma = config["sar_sma_strategy"]
+        supertrend = config["supertrend_ma_strategy"]
+
+        scan_config = cls(
+            timeframe=scanning["timeframe"],
+            cache_klines=scanning.get("cache_klines", True),
+            incremental_indicators=scanning.get("incremental_indicators", False),
+            sar_sma=SarSmaParams(
+                sar_start=sar_sma["sar_start"],
+                sar_increment=sar_sma["sar_increment"],
+                sar_max=sar_sma["sar_max"],
+                sma_fast=sar_sma["sma_fast"],
+                sma_slow=sar_sma["sma_slow"]
+            ),
+            supertrend_ma=SuperTrendParams(
+                ma_type=supertrend["ma_type"],
+                ma_length=supertrend["ma_length"],
+                atr_period=supertrend["atr_period"],
+                atr_multiplier=supertrend["atr_multiplier"],
+                change_atr=supertrend.get("change_atr", True)
+            )
+        )
+        return replace(scan_config, **overrides) if overrides else scan_config
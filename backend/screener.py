@@ -16,6 +16,8 @@ Version: 2.0 - SAR+SMA and SuperTrend MA
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 import time
@@ -23,10 +25,20 @@ from datetime import datetime, timedelta
 import json
 import os
 import sys
+import io
+import contextlib
+import copy
 from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from indicators import parabolic_sar, supertrend_ma
+from rate_limiter import binance_limiter, yahoo_limiter
+from kline_cache import kline_cache
+from ticker_snapshot import TickerSnapshot
+from streaming_indicators import SarSmaStream, SuperTrendStream, StreamingState
+from scan_config import ScanConfig
+
 # WhatsApp support
 WHATSAPP_AVAILABLE = False
 try:
@@ -50,6 +62,31 @@ except Exception as e:
     EMAIL_AVAILABLE = False
     print(f"⚠️  Email support failed to load: {e}")
 
+# Candles each strategy needs; a symbol is fetched once with the largest value
+STRATEGY_BARS = {
+    "SAR_SMA": 100,
+    "SUPERTREND_MA": 150
+}
+
+def klines_to_dataframe(data: List[List]) -> pd.DataFrame:
+    """Convert a Binance /klines payload into the screener's candle DataFrame"""
+    df = pd.DataFrame(data, columns=[
+        'timestamp', 'open', 'high', 'low', 'close', 'volume',
+        'close_time', 'quote_asset_volume', 'number_of_trades',
+        'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
+    ])
+    
+    # Convert to numeric
+    numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']
+    for col in numeric_columns:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+    # Add timestamp
+    df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df['market_type'] = 'CRYPTO'
+    
+    return df
+
 class CryptoForexScreener:
     """
     Crypto & Forex Screener with 2 Strategies:
@@ -59,14 +96,19 @@ class CryptoForexScreener:
     Supports: Crypto (USDT pairs) + Forex (Gold, USD, EUR, GBP pairs)
     """
     
-    def __init__(self, config_file="screener_config.json"):
+    def __init__(self, config_file="screener_config.json", config: Optional[Dict] = None):
         self.crypto_base_url = "https://api.binance.com/api/v3"
         self.forex_base_url = "https://api.exchangerate-api.com/v4/latest"
         self.config_file = config_file
         self.signals_file = "signals.json"
         
-        # Load or create config
-        self.config = self.load_config()
+        # Load or create config (a config passed in is used as-is and the file is never touched)
+        self.config = copy.deepcopy(config) if config is not None else self.load_config()
+        
+        # Pooled keep-alive HTTP session used by every fetcher
+        http_config = self.config["http"]
+        self.http_timeout = (http_config["connect_timeout"], http_config["read_timeout"])
+        self.session = self.create_http_session()
         
         # Signal tracking
         self.all_signals = [] 
@@ -98,7 +140,30 @@ class CryptoForexScreener:
                 "scan_crypto": True,
                 "scan_forex": True,
                 "crypto_top_coins": 30,
-                "forex_pairs": ["XAUUSD", "EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "USDCAD", "USDCHF", "NZDUSD"]
+                "forex_pairs": ["XAUUSD", "EURUSD", "GBPUSD", "USDJPY", "AUDUSD", "USDCAD", "USDCHF", "NZDUSD"],
+                "max_workers": 8,  # Symbols scanned in parallel by the API scanner
+                "cache_klines": True,  # Keep closed candles and only fetch new ones (crypto)
+                "incremental_indicators": False,  # Carry indicator state between scans instead of recomputing windows (crypto)
+                "process_workers": 0,  # >0: API scanner evaluates strategies in this many worker processes
+                "auto_scan_enabled": False,  # API server scans in the background on every candle close
+                "auto_scan_timeframes": [],  # Timeframes for background scans, empty = timeframe above
+                "auto_scan_grace_seconds": 5,  # Delay after the candle close so the exchange has finalized it
+                "ticker_refresh_seconds": 15,  # API server: max age of the shared 24h ticker snapshot
+                "scan_wait_seconds": 120,  # API server: how long a non-leader worker waits for the leader's scan
+                "scan_poll_seconds": 0.5  # API server: how often waiting workers and the leader check the shared store
+            },
+            "http": {
+                "pool_size": 16,  # Keep-alive connections per host, keep >= max_workers
+                "retries": 3,
+                "backoff_factor": 0.3,
+                "connect_timeout": 3.05,
+                "read_timeout": 10
+            },
+            "price_feed": {
+                "poll_seconds": 2,  # One batched crypto ticker request per interval, shared by all watchers
+                "forex_poll_seconds": 60,  # Forex prices come from hourly candles, refresh them less often
+                "client_throttle_seconds": 1,  # Minimum gap between price messages to one client
+                "max_symbols_per_client": 50
             },
             "sar_sma_strategy": {
                 "sar_start": 0.02,
@@ -153,6 +218,33 @@ class CryptoForexScreener:
         
         return default_config
 
+    def create_http_session(self) -> requests.Session:
+        """Create a pooled keep-alive session with retries and backoff"""
+        http_config = self.config["http"]
+        
+        # 429/418 are left to binance_limiter so it can see them and back off globally
+        retry = Retry(
+            total=http_config["retries"],
+            backoff_factor=http_config["backoff_factor"],
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET"],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=http_config["pool_size"],
+            pool_maxsize=http_config["pool_size"],
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_scan_config(self, **overrides) -> ScanConfig:
+        """Immutable snapshot of the current config for one scan (overrides e.g. timeframe)"""
+        return ScanConfig.from_config(self.config, **overrides)
+
     def get_crypto_top_coins(self, limit: int = None) -> List[str]:
         """Get top crypto coins by 24h volume"""
         if limit is None:
@@ -160,26 +252,32 @@ class CryptoForexScreener:
             
         try:
             url = f"{self.crypto_base_url}/ticker/24hr"
-            response = requests.get(url, timeout=10)
+            binance_limiter.acquire_endpoint("ticker/24hr")
+            response = self.session.get(url, timeout=self.http_timeout)
+            binance_limiter.update_from_response(response)
             response.raise_for_status()
             data = response.json()
             
-            # Filter USDT pairs with minimum volume
-            min_volume = self.config["scanning"]["min_volume"]
-            usdt_pairs = [
-                coin for coin in data 
-                if coin['symbol'].endswith('USDT') 
-                and float(coin['quoteVolume']) > min_volume
-            ]
-            
-            # Sort by volume and return top coins
-            sorted_coins = sorted(usdt_pairs, key=lambda x: float(x['quoteVolume']), reverse=True)
-            return [coin['symbol'] for coin in sorted_coins[:limit]]
+            return self.select_top_coins(data, limit)
             
         except Exception as e:
             print(f"❌ Error fetching crypto list: {e}")
             return self.get_default_crypto_coins()
 
+    def get_crypto_tickers(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        """Get the 24h ticker for the given symbols in one call, or all symbols (raises on failure)"""
+        url = f"{self.crypto_base_url}/ticker/24hr"
+        params = {"symbols": json.dumps(symbols, separators=(",", ":"))} if symbols else None
+        binance_limiter.acquire_endpoint("ticker/24hr", params)
+        response = self.session.get(url, params=params, timeout=self.http_timeout)
+        binance_limiter.update_from_response(response)
+        response.raise_for_status()
+        return response.json()
+
+    def select_top_coins(self, tickers: List[Dict], limit: int) -> List[str]:
+        """Pick the top USDT pairs by quote volume from a /ticker/24hr payload"""
+        return TickerSnapshot(tickers).top_usdt(limit, self.config["scanning"]["min_volume"])
+
     def get_default_crypto_coins(self) -> List[str]:
         """Fallback crypto coin list if API fails"""
         return [
@@ -205,10 +303,13 @@ class CryptoForexScreener:
         
         return all_pairs
 
-    def get_crypto_klines(self, symbol: str, interval: str = None, limit: int = 200) -> Optional[pd.DataFrame]:
-        """Get crypto candlestick data from Binance"""
+    def get_crypto_klines(self, symbol: str, interval: str = None, limit: int = 200,
+                          scan_config: Optional[ScanConfig] = None) -> Optional[pd.DataFrame]:
+        """Get crypto candlestick data from Binance (only new candles when cached)"""
+        if scan_config is None:
+            scan_config = self.get_scan_config()
         if interval is None:
-            interval = self.config["scanning"]["timeframe"]
+            interval = scan_config.timeframe
             
         url = f"{self.crypto_base_url}/klines"
         params = {
@@ -217,26 +318,23 @@ class CryptoForexScreener:
             'limit': limit
         }
         
+        use_cache = scan_config.cache_klines
+        if use_cache:
+            start_time = kline_cache.start_time(symbol, "CRYPTO", interval, limit)
+            if start_time is not None:
+                params['startTime'] = start_time
+        
         try:
-            response = requests.get(url, params=params, timeout=10)
+            binance_limiter.acquire_endpoint("klines", params)
+            response = self.session.get(url, params=params, timeout=self.http_timeout)
+            binance_limiter.update_from_response(response)
             response.raise_for_status()
             data = response.json()
             
-            df = pd.DataFrame(data, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            # Convert to numeric
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']
-            for col in numeric_columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-            # Add timestamp
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['market_type'] = 'CRYPTO'
-            
+            df = klines_to_dataframe(data)
+            if use_cache:
+                return kline_cache.merge(symbol, "CRYPTO", interval, df, limit,
+                                         incremental='startTime' in params)
             return df
             
         except Exception as e:
@@ -279,6 +377,7 @@ class CryptoForexScreener:
                 period = "90d"
             
             # Fetch data from TradingView via yfinance
+            yahoo_limiter.acquire()
             ticker = yf.Ticker(tv_symbol)
             hist = ticker.history(period=period, interval=yf_interval)
             
@@ -361,10 +460,11 @@ class CryptoForexScreener:
         # Return mapped symbol or try original format
         return symbol_map.get(symbol.upper(), f"{symbol}=X")
 
-    def get_forex_klines(self, symbol: str, interval: str = None, limit: int = 200) -> Optional[pd.DataFrame]:
+    def get_forex_klines(self, symbol: str, interval: str = None, limit: int = 200,
+                         scan_config: Optional[ScanConfig] = None) -> Optional[pd.DataFrame]:
         """Get forex candlestick data from TradingView (free)"""
         if interval is None:
-            interval = self.config["scanning"]["timeframe"]
+            interval = (scan_config or self.get_scan_config()).timeframe
         
         # Use TradingView data via yfinance (free, no API key needed)
         forex_data = self.get_tradingview_data(symbol, interval, limit)
@@ -377,12 +477,13 @@ class CryptoForexScreener:
         print("💡 Make sure you have 'yfinance' installed: pip install yfinance")
         return None
 
-    def get_klines(self, symbol: str, market_type: str = "CRYPTO", interval: str = None, limit: int = 200) -> Optional[pd.DataFrame]:
+    def get_klines(self, symbol: str, market_type: str = "CRYPTO", interval: str = None, limit: int = 200,
+                   scan_config: Optional[ScanConfig] = None) -> Optional[pd.DataFrame]:
         """Get candlestick data for both crypto and forex"""
         if market_type == "CRYPTO":
-            return self.get_crypto_klines(symbol, interval, limit)
+            return self.get_crypto_klines(symbol, interval, limit, scan_config)
         elif market_type == "FOREX":
-            return self.get_forex_klines(symbol, interval, limit)
+            return self.get_forex_klines(symbol, interval, limit, scan_config)
         else:
             print(f"❌ Unknown market type: {market_type}")
             return None
@@ -410,275 +511,312 @@ class CryptoForexScreener:
         
         return atr
 
-    def calculate_sar(self, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-        """Calculate Parabolic SAR"""
-        config = self.config["sar_sma_strategy"]
-        af_start = config["sar_start"]
-        af_increment = config["sar_increment"] 
-        af_max = config["sar_max"]
-        
-        length = len(high)
-        sar = np.zeros(length)
-        trend = np.zeros(length)
-        af = np.zeros(length)
-        ep = np.zeros(length)
+    def calculate_sar(self, high: pd.Series, low: pd.Series, close: pd.Series,
+                      scan_config: Optional[ScanConfig] = None) -> pd.Series:
+        """Calculate Parabolic SAR (NumPy kernel in indicators.py)"""
+        config = (scan_config or self.get_scan_config()).sar_sma
+        af_start = config.sar_start
+        af_increment = config.sar_increment
+        af_max = config.sar_max
         
-        # Initialize
-        sar[0] = low.iloc[0]
-        trend[0] = 1
-        af[0] = af_start
-        ep[0] = high.iloc[0]
-        
-        for i in range(1, length):
-            if trend[i-1] == 1:  # Uptrend
-                sar[i] = sar[i-1] + af[i-1] * (ep[i-1] - sar[i-1])
-                
-                if i >= 2:
-                    sar[i] = min(sar[i], low.iloc[i-1], low.iloc[i-2])
-                elif i >= 1:
-                    sar[i] = min(sar[i], low.iloc[i-1])
-                
-                if low.iloc[i] <= sar[i]:
-                    trend[i] = -1
-                    sar[i] = ep[i-1]
-                    ep[i] = low.iloc[i]
-                    af[i] = af_start
-                else:
-                    trend[i] = 1
-                    if high.iloc[i] > ep[i-1]:
-                        ep[i] = high.iloc[i]
-                        af[i] = min(af[i-1] + af_increment, af_max)
-                    else:
-                        ep[i] = ep[i-1]
-                        af[i] = af[i-1]
-                        
-            else:  # Downtrend
-                sar[i] = sar[i-1] + af[i-1] * (ep[i-1] - sar[i-1])
-                
-                if i >= 2:
-                    sar[i] = max(sar[i], high.iloc[i-1], high.iloc[i-2])
-                elif i >= 1:
-                    sar[i] = max(sar[i], high.iloc[i-1])
-                
-                if high.iloc[i] >= sar[i]:
-                    trend[i] = 1
-                    sar[i] = ep[i-1]
-                    ep[i] = high.iloc[i]
-                    af[i] = af_start
-                else:
-                    trend[i] = -1
-                    if low.iloc[i] < ep[i-1]:
-                        ep[i] = low.iloc[i]
-                        af[i] = min(af[i-1] + af_increment, af_max)
-                    else:
-                        ep[i] = ep[i-1]
-                        af[i] = af[i-1]
+        sar, _ = parabolic_sar(
+            high.to_numpy(dtype=np.float64),
+            low.to_numpy(dtype=np.float64),
+            af_start=af_start,
+            af_increment=af_increment,
+            af_max=af_max
+        )
         
         return pd.Series(sar, index=high.index)
 
     def calculate_supertrend_ma(self, df: pd.DataFrame, ma_type: str = "EMA", 
                                ma_length: int = 100, atr_period: int = 10, 
                                atr_multiplier: float = 0.5, change_atr: bool = True) -> Dict:
-        """Calculate SuperTrended Moving Average indicator"""
-        
-        # Calculate the selected moving average
-        if ma_type == "SMA":
-            ma = self.calculate_sma(df['close'], ma_length)
-        elif ma_type == "EMA":
-            ma = self.calculate_ema(df['close'], ma_length)
-        else:  # Default to EMA
-            ma = self.calculate_ema(df['close'], ma_length)
-        
-        # Calculate ATR
-        if change_atr:
-            # Standard ATR calculation
-            atr = self.calculate_atr(df['high'], df['low'], df['close'], atr_period)
-        else:
-            # Simple TR average
-            tr = pd.concat([
-                df['high'] - df['low'],
-                abs(df['high'] - df['close'].shift()),
-                abs(df['low'] - df['close'].shift())
-            ], axis=1).max(axis=1)
-            atr = tr.rolling(window=atr_period).mean()
-        
-        # Calculate bands
-        up = ma - atr_multiplier * atr
-        dn = ma + atr_multiplier * atr
-        
-        # Initialize trend
-        trend = pd.Series(1, index=df.index)
-        final_up = pd.Series(index=df.index, dtype=float)
-        final_dn = pd.Series(index=df.index, dtype=float)
-        
-        for i in range(1, len(df)):
-            # Update up band
-            if pd.notna(up.iloc[i]) and pd.notna(up.iloc[i-1]):
-                if df['close'].iloc[i-1] > final_up.iloc[i-1] if pd.notna(final_up.iloc[i-1]) else True:
-                    final_up.iloc[i] = max(up.iloc[i], final_up.iloc[i-1] if pd.notna(final_up.iloc[i-1]) else up.iloc[i])
-                else:
-                    final_up.iloc[i] = up.iloc[i]
-            else:
-                final_up.iloc[i] = up.iloc[i] if pd.notna(up.iloc[i]) else final_up.iloc[i-1]
-            
-            # Update down band
-            if pd.notna(dn.iloc[i]) and pd.notna(dn.iloc[i-1]):
-                if df['close'].iloc[i-1] < final_dn.iloc[i-1] if pd.notna(final_dn.iloc[i-1]) else True:
-                    final_dn.iloc[i] = min(dn.iloc[i], final_dn.iloc[i-1] if pd.notna(final_dn.iloc[i-1]) else dn.iloc[i])
-                else:
-                    final_dn.iloc[i] = dn.iloc[i]
-            else:
-                final_dn.iloc[i] = dn.iloc[i] if pd.notna(dn.iloc[i]) else final_dn.iloc[i-1]
-            
-            # Determine trend
-            if i > 0:
-                if trend.iloc[i-1] == -1:
-                    if df['close'].iloc[i] > final_dn.iloc[i]:
-                        trend.iloc[i] = 1
-                    else:
-                        trend.iloc[i] = -1
-                else:
-                    if df['close'].iloc[i] < final_up.iloc[i]:
-                        trend.iloc[i] = -1
-                    else:
-                        trend.iloc[i] = 1
+        """Calculate SuperTrended Moving Average indicator (NumPy kernel in indicators.py)"""
+        # ATR is the rolling mean of the true range whether or not change_atr is set
+        result = supertrend_ma(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            ma_type=ma_type,
+            ma_length=ma_length,
+            atr_period=atr_period,
+            atr_multiplier=atr_multiplier
+        )
         
         return {
-            'trend': trend,
-            'up_band': final_up,
-            'dn_band': final_dn,
-            'ma': ma
+            'trend': pd.Series(result['trend'], index=df.index),
+            'up_band': pd.Series(result['up_band'], index=df.index),
+            'dn_band': pd.Series(result['dn_band'], index=df.index),
+            'ma': pd.Series(result['ma'], index=df.index)
         }
 
     # ===============================
     # STRATEGY CHECK FUNCTIONS
     # ===============================
 
-    def check_sar_sma_strategy(self, symbol: str, market_type: str = "CRYPTO") -> Optional[Dict]:
-        """Check SAR + SMA Strategy conditions"""
-        df = self.get_klines(symbol, market_type, limit=100)
+    def required_bars(self, strategies: List[str]) -> int:
+        """Candles needed to evaluate every requested strategy (0 if none are known)"""
+        return max([STRATEGY_BARS[s] for s in strategies if s in STRATEGY_BARS], default=0)
+
+    def get_strategy_klines(self, symbol: str, market_type: str, strategies: List[str],
+                            scan_config: Optional[ScanConfig] = None) -> Optional[pd.DataFrame]:
+        """Fetch enough candles for every requested strategy in a single request"""
+        bars = self.required_bars(strategies)
+        if not bars:
+            return None
+        return self.get_klines(symbol, market_type, limit=bars, scan_config=scan_config)
+
+    def slice_klines(self, df: Optional[pd.DataFrame], bars: int) -> Optional[pd.DataFrame]:
+        """Latest `bars` candles as a fresh frame, so strategies can add columns freely"""
+        if df is None:
+            return None
+        return df.tail(bars).reset_index(drop=True)
+
+    def scan_symbol(self, symbol: str, market_type: str, strategies: List[str],
+                    scan_config: Optional[ScanConfig] = None) -> List[Dict]:
+        """
+        Run all strategies on one symbol
+        Candles are fetched once and each strategy gets its own slice
+        """
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+        df = self.get_strategy_klines(symbol, market_type, strategies, scan_config)
+        return self.run_strategies(symbol, market_type, strategies, df, scan_config)
+
+    def run_strategies(self, symbol: str, market_type: str, strategies: List[str],
+                       df: Optional[pd.DataFrame], scan_config: Optional[ScanConfig] = None) -> List[Dict]:
+        """Evaluate strategies on candles that were already fetched"""
+        if df is None:
+            return []
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+
+        incremental = market_type == "CRYPTO" and scan_config.incremental_indicators
+
+        signals = []
+        for strategy in strategies:
+            signal = None
+            
+            if incremental and strategy in ("SAR_SMA", "SUPERTREND_MA"):
+                signal = self.check_strategy_incremental(symbol, market_type, strategy, df, scan_config)
+            elif strategy == "SAR_SMA":
+                signal = self.check_sar_sma_strategy(symbol, market_type, df=df, scan_config=scan_config)
+            elif strategy == "SUPERTREND_MA":
+                signal = self.check_supertrend_ma_strategy(symbol, market_type, df=df, scan_config=scan_config)
+            
+            if signal:
+                signals.append(signal)
+        
+        return signals
+
+    def check_strategy_incremental(self, symbol: str, market_type: str, strategy: str,
+                                   df: pd.DataFrame, scan_config: Optional[ScanConfig] = None) -> Optional[Dict]:
+        """
+        Check a strategy from streaming indicator state kept between scans
+        Closed candles are applied once, the forming candle is evaluated without being committed
+        """
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+        if strategy == "SAR_SMA":
+            params = scan_config.sar_sma.as_dict()
+            stream_class, min_bars, evaluate = SarSmaStream, 50, self.evaluate_sar_sma_signal
+        else:
+            params = scan_config.supertrend_ma.as_dict()
+            stream_class, min_bars, evaluate = SuperTrendStream, 110, self.evaluate_supertrend_ma_signal
+
+        if df is None or len(df) < 2:
+            return None
+
+        try:
+            interval = scan_config.timeframe
+            closed = df.iloc[:-1]
+            forming = df.iloc[-1]
+            candles = (
+                closed['timestamp'].tolist(),
+                closed['high'].tolist(),
+                closed['low'].tolist(),
+                closed['close'].tolist()
+            )
+
+            state = kline_cache.get_state(symbol, market_type, interval, strategy)
+            if state is None or state.params != params:
+                state = StreamingState(stream_class(params), params)
+                kline_cache.set_state(symbol, market_type, interval, strategy, state)
+
+            with state.lock:
+                if not state.advance(*candles):
+                    # Candles were missed since the last scan, seed again from this window
+                    state = StreamingState(stream_class(params), params)
+                    state.advance(*candles)
+                    kline_cache.set_state(symbol, market_type, interval, strategy, state)
+
+                bars = state.bars + 1
+                prev = state.last_values
+                values = state.peek(float(forming['high']), float(forming['low']), float(forming['close']))
+
+            if bars < min_bars or prev is None:
+                return None
+            if any(pd.isna(v) for v in list(prev.values()) + list(values.values())):
+                return None
+
+            latest = dict(values)
+            latest['close'] = forming['close']
+            latest['volume'] = forming['volume']
+            latest['quote_asset_volume'] = forming['quote_asset_volume']
+
+            return evaluate(symbol, market_type, latest, prev, scan_config)
+
+        except Exception as e:
+            print(f"❌ Error analyzing {symbol} ({market_type}) with incremental {strategy}: {e}")
+            return None
+
+    def check_sar_sma_strategy(self, symbol: str, market_type: str = "CRYPTO",
+                               df: Optional[pd.DataFrame] = None,
+                               scan_config: Optional[ScanConfig] = None) -> Optional[Dict]:
+        """Check SAR + SMA Strategy conditions (pass df to reuse already fetched candles)"""
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+        if df is None:
+            df = self.get_klines(symbol, market_type, limit=STRATEGY_BARS["SAR_SMA"], scan_config=scan_config)
+        else:
+            df = self.slice_klines(df, STRATEGY_BARS["SAR_SMA"])
         
         if df is None or len(df) < 50:
             return None
             
         try:
-            config = self.config["sar_sma_strategy"]
-            sma_fast = config["sma_fast"]
-            sma_slow = config["sma_slow"]
+            config = scan_config.sar_sma
+            sma_fast = config.sma_fast
+            sma_slow = config.sma_slow
             
             df['sma_20'] = self.calculate_sma(df['close'], sma_fast)
             df['sma_40'] = self.calculate_sma(df['close'], sma_slow)
-            df['sar'] = self.calculate_sar(df['high'], df['low'], df['close'])
+            df['sar'] = self.calculate_sar(df['high'], df['low'], df['close'], scan_config)
             
             df = df.dropna()
             
             if len(df) < 2:
                 return None
             
-            latest = df.iloc[-1]
-            prev = df.iloc[-2]
-            
-            price = latest['close']
-            sma_20 = latest['sma_20']
-            sma_40 = latest['sma_40']
-            sar = latest['sar']
-            
-            prev_sma_20 = prev['sma_20']
-            prev_sma_40 = prev['sma_40']
-            
-            # LONG CONDITIONS
-            condition_1_long = sar < price
-            condition_2_long = (sma_20 > sma_40) and (prev_sma_20 <= prev_sma_40)
-            condition_3_long = (price > sma_20) and (price > sma_40)
-            
-            long_signal = condition_1_long and condition_2_long and condition_3_long
-            
-            # SHORT CONDITIONS
-            condition_1_short = sar > price
-            condition_2_short = (sma_20 < sma_40) and (prev_sma_20 >= prev_sma_40)
-            condition_3_short = (price < sma_20) and (price < sma_40)
-            
-            short_signal = condition_1_short and condition_2_short and condition_3_short
-            
-            if long_signal or short_signal:
-                # Dynamic TP/SL based on market type
-                if market_type == "FOREX":
-                    if 'JPY' in symbol:
-                        pip_value = 0.01  # JPY pairs
-                    elif 'XAU' in symbol:  # Gold
-                        pip_value = 0.50  
-                    else:
-                        pip_value = 0.0001  # Major pairs
-                    
-                    if long_signal:
-                        tp1 = round(float(price + (pip_value * 20)), 5)  # 20 pips
-                        tp2 = round(float(price + (pip_value * 40)), 5)  # 40 pips
-                        sl = round(float(sar - (pip_value * 5)), 5)
-                    else:
-                        tp1 = round(float(price - (pip_value * 20)), 5)
-                        tp2 = round(float(price - (pip_value * 40)), 5)
-                        sl = round(float(sar + (pip_value * 5)), 5)
-                else:  # CRYPTO
-                    if long_signal:
-                        tp1 = round(float(price * 1.015), 6)
-                        tp2 = round(float(price * 1.03), 6)
-                        sl = round(float(sar * 0.998), 6)
-                    else:
-                        tp1 = round(float(price * 0.985), 6)
-                        tp2 = round(float(price * 0.97), 6)
-                        sl = round(float(sar * 1.002), 6)
-                
-                signal_data = {
-                    'symbol': symbol,
-                    'market_type': market_type,
-                    'strategy': 'SAR_SMA',
-                    'price': round(float(price), 6),
-                    'signal': 'LONG' if long_signal else 'SHORT',
-                    'sma_20': round(float(sma_20), 6),
-                    'sma_40': round(float(sma_40), 6),
-                    'sar': round(float(sar), 6),
-                    'tp1': tp1,
-                    'tp2': tp2,
-                    'stop_loss': sl,
-                    'volume': float(latest['volume']),
-                    'quote_volume': float(latest['quote_asset_volume']),
-                    'timestamp': datetime.now().isoformat(),
-                    'timeframe': self.config["scanning"]["timeframe"],
-                    'conditions': {
-                        'condition_1': f"✅ SAR {'Below' if long_signal else 'Above'} Price",
-                        'condition_2': f"✅ SMA 20 Cross {'Above' if long_signal else 'Below'} SMA 40",
-                        'condition_3': f"✅ Price {'Above' if long_signal else 'Below'} Both SMAs"
-                    },
-                    'accuracy': '60-65%',
-                    'all_conditions_met': True
-                }
-                
-                return signal_data
-            
-            return None
+            return self.evaluate_sar_sma_signal(symbol, market_type, df.iloc[-1], df.iloc[-2], scan_config)
             
         except Exception as e:
             print(f"❌ Error analyzing {symbol} ({market_type}) with SAR+SMA: {e}")
             return None
 
-    def check_supertrend_ma_strategy(self, symbol: str, market_type: str = "CRYPTO") -> Optional[Dict]:
-        """Check SuperTrended Moving Average Strategy conditions"""
-        df = self.get_klines(symbol, market_type, limit=150)
+    def evaluate_sar_sma_signal(self, symbol: str, market_type: str, latest, prev,
+                                scan_config: Optional[ScanConfig] = None) -> Optional[Dict]:
+        """
+        Apply the SAR + SMA entry rules to the latest and previous candle values
+        latest needs close/sma_20/sma_40/sar/volume/quote_asset_volume, prev needs sma_20/sma_40
+        """
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+        price = latest['close']
+        sma_20 = latest['sma_20']
+        sma_40 = latest['sma_40']
+        sar = latest['sar']
+
+        prev_sma_20 = prev['sma_20']
+        prev_sma_40 = prev['sma_40']
+
+        # LONG CONDITIONS
+        condition_1_long = sar < price
+        condition_2_long = (sma_20 > sma_40) and (prev_sma_20 <= prev_sma_40)
+        condition_3_long = (price > sma_20) and (price > sma_40)
+
+        long_signal = condition_1_long and condition_2_long and condition_3_long
+
+        # SHORT CONDITIONS
+        condition_1_short = sar > price
+        condition_2_short = (sma_20 < sma_40) and (prev_sma_20 >= prev_sma_40)
+        condition_3_short = (price < sma_20) and (price < sma_40)
+
+        short_signal = condition_1_short and condition_2_short and condition_3_short
+
+        if long_signal or short_signal:
+            # Dynamic TP/SL based on market type
+            if market_type == "FOREX":
+                if 'JPY' in symbol:
+                    pip_value = 0.01  # JPY pairs
+                elif 'XAU' in symbol:  # Gold
+                    pip_value = 0.50  
+                else:
+                    pip_value = 0.0001  # Major pairs
+
+                if long_signal:
+                    tp1 = round(float(price + (pip_value * 20)), 5)  # 20 pips
+                    tp2 = round(float(price + (pip_value * 40)), 5)  # 40 pips
+                    sl = round(float(sar - (pip_value * 5)), 5)
+                else:
+                    tp1 = round(float(price - (pip_value * 20)), 5)
+                    tp2 = round(float(price - (pip_value * 40)), 5)
+                    sl = round(float(sar + (pip_value * 5)), 5)
+            else:  # CRYPTO
+                if long_signal:
+                    tp1 = round(float(price * 1.015), 6)
+                    tp2 = round(float(price * 1.03), 6)
+                    sl = round(float(sar * 0.998), 6)
+                else:
+                    tp1 = round(float(price * 0.985), 6)
+                    tp2 = round(float(price * 0.97), 6)
+                    sl = round(float(sar * 1.002), 6)
+
+            signal_data = {
+                'symbol': symbol,
+                'market_type': market_type,
+                'strategy': 'SAR_SMA',
+                'price': round(float(price), 6),
+                'signal': 'LONG' if long_signal else 'SHORT',
+                'sma_20': round(float(sma_20), 6),
+                'sma_40': round(float(sma_40), 6),
+                'sar': round(float(sar), 6),
+                'tp1': tp1,
+                'tp2': tp2,
+                'stop_loss': sl,
+                'volume': float(latest['volume']),
+                'quote_volume': float(latest['quote_asset_volume']),
+                'timestamp': datetime.now().isoformat(),
+                'timeframe': scan_config.timeframe,
+                'conditions': {
+                    'condition_1': f"✅ SAR {'Below' if long_signal else 'Above'} Price",
+                    'condition_2': f"✅ SMA 20 Cross {'Above' if long_signal else 'Below'} SMA 40",
+                    'condition_3': f"✅ Price {'Above' if long_signal else 'Below'} Both SMAs"
+                },
+                'accuracy': '60-65%',
+                'all_conditions_met': True
+            }
+
+            return signal_data
+
+        return None
+
+    def check_supertrend_ma_strategy(self, symbol: str, market_type: str = "CRYPTO",
+                                     df: Optional[pd.DataFrame] = None,
+                                     scan_config: Optional[ScanConfig] = None) -> Optional[Dict]:
+        """Check SuperTrended Moving Average Strategy conditions (pass df to reuse already fetched candles)"""
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+        if df is None:
+            df = self.get_klines(symbol, market_type, limit=STRATEGY_BARS["SUPERTREND_MA"], scan_config=scan_config)
+        else:
+            df = self.slice_klines(df, STRATEGY_BARS["SUPERTREND_MA"])
         
         if df is None or len(df) < 110:
             return None
             
         try:
-            config = self.config["supertrend_ma_strategy"]
+            config = scan_config.supertrend_ma
             
             # Calculate SuperTrend MA
             st_ma = self.calculate_supertrend_ma(
                 df,
-                ma_type=config["ma_type"],
-                ma_length=config["ma_length"],
-                atr_period=config["atr_period"],
-                atr_multiplier=config["atr_multiplier"],
-                change_atr=config["change_atr"]
+                ma_type=config.ma_type,
+                ma_length=config.ma_length,
+                atr_period=config.atr_period,
+                atr_multiplier=config.atr_multiplier,
+                change_atr=config.change_atr
             )
             
             df['trend'] = st_ma['trend']
@@ -692,89 +830,96 @@ class CryptoForexScreener:
             if len(df) < 2:
                 return None
             
-            # Get latest and previous values
-            latest = df.iloc[-1]
-            prev = df.iloc[-2]
-            
-            price = latest['close']
-            trend = latest['trend']
-            prev_trend = prev['trend']
-            ma_value = latest['ma']
-            
-            # BUY SIGNAL: Trend changes from -1 to 1 (bearish to bullish)
-            buy_signal = (trend == 1) and (prev_trend == -1)
-            
-            # SELL SIGNAL: Trend changes from 1 to -1 (bullish to bearish)
-            sell_signal = (trend == -1) and (prev_trend == 1)
-            
-            if buy_signal or sell_signal:
-                # Get the active band
-                if trend == 1:
-                    active_band = latest['up_band']
-                else:
-                    active_band = latest['dn_band']
-                
-                # Calculate TP/SL based on market type
-                if market_type == "FOREX":
-                    if 'JPY' in symbol:
-                        pip_value = 0.01
-                    elif 'XAU' in symbol:  # Gold
-                        pip_value = 0.75
-                    else:
-                        pip_value = 0.0001
-                    
-                    if buy_signal:
-                        tp1 = round(float(price + (pip_value * 30)), 5)
-                        tp2 = round(float(price + (pip_value * 60)), 5)
-                        sl = round(float(active_band - (pip_value * 10)), 5)
-                    else:
-                        tp1 = round(float(price - (pip_value * 30)), 5)
-                        tp2 = round(float(price - (pip_value * 60)), 5)
-                        sl = round(float(active_band + (pip_value * 10)), 5)
-                else:  # CRYPTO
-                    if buy_signal:
-                        tp1 = round(float(price * 1.025), 6)
-                        tp2 = round(float(price * 1.05), 6)
-                        sl = round(float(active_band * 0.995), 6)
-                    else:
-                        tp1 = round(float(price * 0.975), 6)
-                        tp2 = round(float(price * 0.95), 6)
-                        sl = round(float(active_band * 1.005), 6)
-                
-                signal_data = {
-                    'symbol': symbol,
-                    'market_type': market_type,
-                    'strategy': 'SUPERTREND_MA',
-                    'price': round(float(price), 6),
-                    'signal': 'LONG' if buy_signal else 'SHORT',
-                    'ma_value': round(float(ma_value), 6),
-                    'ma_type': config["ma_type"],
-                    'trend': 'BULLISH' if trend == 1 else 'BEARISH',
-                    'active_band': round(float(active_band), 6),
-                    'tp1': tp1,
-                    'tp2': tp2,
-                    'stop_loss': sl,
-                    'volume': float(latest['volume']),
-                    'quote_volume': float(latest['quote_asset_volume']),
-                    'timestamp': datetime.now().isoformat(),
-                    'timeframe': self.config["scanning"]["timeframe"],
-                    'conditions': {
-                        'condition_1': f"✅ Trend Changed: {'BEARISH→BULLISH' if buy_signal else 'BULLISH→BEARISH'}",
-                        'condition_2': f"✅ Price {'Above' if buy_signal else 'Below'} {config['ma_type']} {config['ma_length']}",
-                        'condition_3': f"✅ SuperTrend Signal Confirmed"
-                    },
-                    'accuracy': '75-80%',
-                    'all_conditions_met': True
-                }
-                
-                return signal_data
-            
-            return None
+            return self.evaluate_supertrend_ma_signal(symbol, market_type, df.iloc[-1], df.iloc[-2], scan_config)
             
         except Exception as e:
             print(f"❌ Error analyzing {symbol} ({market_type}) with SuperTrend MA: {e}")
             return None
 
+    def evaluate_supertrend_ma_signal(self, symbol: str, market_type: str, latest, prev,
+                                      scan_config: Optional[ScanConfig] = None) -> Optional[Dict]:
+        """
+        Apply the SuperTrend MA entry rules to the latest and previous candle values
+        latest needs close/trend/up_band/dn_band/ma/volume/quote_asset_volume, prev needs trend
+        """
+        if scan_config is None:
+            scan_config = self.get_scan_config()
+        config = scan_config.supertrend_ma
+        price = latest['close']
+        trend = latest['trend']
+        prev_trend = prev['trend']
+        ma_value = latest['ma']
+
+        # BUY SIGNAL: Trend changes from -1 to 1 (bearish to bullish)
+        buy_signal = (trend == 1) and (prev_trend == -1)
+
+        # SELL SIGNAL: Trend changes from 1 to -1 (bullish to bearish)
+        sell_signal = (trend == -1) and (prev_trend == 1)
+
+        if buy_signal or sell_signal:
+            # Get the active band
+            if trend == 1:
+                active_band = latest['up_band']
+            else:
+                active_band = latest['dn_band']
+
+            # Calculate TP/SL based on market type
+            if market_type == "FOREX":
+                if 'JPY' in symbol:
+                    pip_value = 0.01
+                elif 'XAU' in symbol:  # Gold
+                    pip_value = 0.75
+                else:
+                    pip_value = 0.0001
+
+                if buy_signal:
+                    tp1 = round(float(price + (pip_value * 30)), 5)
+                    tp2 = round(float(price + (pip_value * 60)), 5)
+                    sl = round(float(active_band - (pip_value * 10)), 5)
+                else:
+                    tp1 = round(float(price - (pip_value * 30)), 5)
+                    tp2 = round(float(price - (pip_value * 60)), 5)
+                    sl = round(float(active_band + (pip_value * 10)), 5)
+            else:  # CRYPTO
+                if buy_signal:
+                    tp1 = round(float(price * 1.025), 6)
+                    tp2 = round(float(price * 1.05), 6)
+                    sl = round(float(active_band * 0.995), 6)
+                else:
+                    tp1 = round(float(price * 0.975), 6)
+                    tp2 = round(float(price * 0.95), 6)
+                    sl = round(float(active_band * 1.005), 6)
+
+            signal_data = {
+                'symbol': symbol,
+                'market_type': market_type,
+                'strategy': 'SUPERTREND_MA',
+                'price': round(float(price), 6),
+                'signal': 'LONG' if buy_signal else 'SHORT',
+                'ma_value': round(float(ma_value), 6),
+                'ma_type': config.ma_type,
+                'trend': 'BULLISH' if trend == 1 else 'BEARISH',
+                'active_band': round(float(active_band), 6),
+                'tp1': tp1,
+                'tp2': tp2,
+                'stop_loss': sl,
+                'volume': float(latest['volume']),
+                'quote_volume': float(latest['quote_asset_volume']),
+                'timestamp': datetime.now().isoformat(),
+                'timeframe': scan_config.timeframe,
+                'conditions': {
+                    'condition_1': f"✅ Trend Changed: {'BEARISH→BULLISH' if buy_signal else 'BULLISH→BEARISH'}",
+                    'condition_2': f"✅ Price {'Above' if buy_signal else 'Below'} {config.ma_type} {config.ma_length}",
+                    'condition_3': f"✅ SuperTrend Signal Confirmed"
+                },
+                'accuracy': '75-80%',
+                'all_conditions_met': True
+            }
+
+            return signal_data
+
+        return None
+
     # ===============================
     # ALERT & NOTIFICATION FUNCTIONS
     # ===============================
@@ -1042,6 +1187,7 @@ Volume: {signal['volume']:,.0f}
         active_strategies = self.config["scanning"]["active_strategies"]
         scan_crypto = self.config["scanning"]["scan_crypto"]
         scan_forex = self.config["scanning"]["scan_forex"]
+        scan_config = self.get_scan_config()
         
         all_signals = []
         total_symbols = 0
@@ -1061,7 +1207,7 @@ Volume: {signal['volume']:,.0f}
         print(f"\n🔍 Scanning {total_symbols} symbols with 2 strategies...")
         print(f"💰 Crypto symbols: {len(crypto_symbols)}")
         print(f"💱 Forex symbols: {len(forex_symbols)}")
-        print(f"⏰ Timeframe: {self.config['scanning']['timeframe']}")
+        print(f"⏰ Timeframe: {scan_config.timeframe}")
         print(f"📊 Active Strategies: {', '.join(active_strategies)}")
         print("="*60)
         
@@ -1075,20 +1221,10 @@ Volume: {signal['volume']:,.0f}
                 progress = f"({symbol_count}/{total_symbols})"
                 print(f"Checking {symbol} (CRYPTO)... {progress}", end='\r')
                 
-                # Check all strategies for crypto
-                for strategy in active_strategies:
-                    signal = None
-                    
-                    if strategy == "SAR_SMA":
-                        signal = self.check_sar_sma_strategy(symbol, "CRYPTO")
-                    elif strategy == "SUPERTREND_MA":
-                        signal = self.check_supertrend_ma_strategy(symbol, "CRYPTO")
-                    
-                    if signal:
-                        all_signals.append(signal)
-                        print(f"\n🚨 CRYPTO {strategy} SIGNAL: {signal['symbol']} - {signal['signal']} at ${signal['price']} ✅")
-                
-                time.sleep(0.1)  # Rate limiting
+                # Check all strategies for crypto (one kline fetch per symbol)
+                for signal in self.scan_symbol(symbol, "CRYPTO", active_strategies, scan_config):
+                    all_signals.append(signal)
+                    print(f"\n🚨 CRYPTO {signal['strategy']} SIGNAL: {signal['symbol']} - {signal['signal']} at ${signal['price']} ✅")
         
         # Scan Forex Markets
         if scan_forex and forex_symbols:
@@ -1098,20 +1234,10 @@ Volume: {signal['volume']:,.0f}
                 progress = f"({symbol_count}/{total_symbols})"
                 print(f"Checking {symbol} (FOREX)... {progress}", end='\r')
                 
-                # Check all strategies for forex
-                for strategy in active_strategies:
-                    signal = None
-                    
-                    if strategy == "SAR_SMA":
-                        signal = self.check_sar_sma_strategy(symbol, "FOREX")
-                    elif strategy == "SUPERTREND_MA":
-                        signal = self.check_supertrend_ma_strategy(symbol, "FOREX")
-                    
-                    if signal:
-                        all_signals.append(signal)
-                        print(f"\n🚨 FOREX {strategy} SIGNAL: {signal['symbol']} - {signal['signal']} at ${signal['price']} ✅")
-                
-                time.sleep(0.15)  # Slightly slower for forex to avoid rate limits
+                # Check all strategies for forex (one kline fetch per symbol)
+                for signal in self.scan_symbol(symbol, "FOREX", active_strategies, scan_config):
+                    all_signals.append(signal)
+                    print(f"\n🚨 FOREX {signal['strategy']} SIGNAL: {signal['symbol']} - {signal['signal']} at ${signal['price']} ✅")
         
         print(f"\n\n✅ Scan complete! Found {len(all_signals)} total signals.")
         return all_signals
@@ -1203,8 +1329,9 @@ Press Ctrl+C to stop scanning...
                 print(f"💤 Next scan in {interval_minutes} minutes...")
                 print("="*50)
                 
-                # Wait for next scan
-                time.sleep(interval_minutes * 60)
+                # Wait for the next interval boundary (no drift from scan duration)
+                interval_seconds = interval_minutes * 60
+                time.sleep(interval_seconds - (time.time() % interval_seconds) + config.get("auto_scan_grace_seconds", 5))
                 
         except KeyboardInterrupt:
             print(f"\n\n🛑 SCANNING STOPPED BY USER")
@@ -1218,6 +1345,40 @@ Press Ctrl+C to stop scanning...
             json.dump(self.config, f, indent=2)
         print("✅ Configuration updated!")
 
+# ============================================================================
+# PROCESS POOL EVALUATION
+# ============================================================================
+
+# Candle columns shipped to worker processes (plain NumPy arrays pickle cheaply)
+PAYLOAD_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']
+
+# Screener owned by a worker process (set by init_strategy_process)
+_process_screener = None
+
+def klines_to_payload(df: Optional[pd.DataFrame]) -> Optional[Dict[str, np.ndarray]]:
+    """Raw OHLCV arrays of a candle DataFrame, the only data a worker process needs"""
+    if df is None:
+        return None
+    return {col: df[col].to_numpy() for col in PAYLOAD_COLUMNS if col in df.columns}
+
+def init_strategy_process(config: Dict) -> None:
+    """
+    ProcessPoolExecutor initializer: build one quiet screener per worker process
+    from the parent's config dict; workers never read or rewrite the config file
+    """
+    global _process_screener
+    with contextlib.redirect_stdout(io.StringIO()):
+        _process_screener = CryptoForexScreener(config=config)
+
+def evaluate_strategies(symbol: str, market_type: str, strategies: List[str],
+                        payload: Optional[Dict[str, np.ndarray]], scan_config: ScanConfig) -> List[Dict]:
+    """Run strategies on raw candle arrays (process pool entry point, returns plain signal dicts)"""
+    if payload is None:
+        return []
+    if _process_screener is None:
+        raise RuntimeError("init_strategy_process() must run before evaluate_strategies()")
+    return _process_screener.run_strategies(symbol, market_type, strategies, pd.DataFrame(payload), scan_config)
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
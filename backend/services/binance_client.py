@@ -0,0 +1,85 @@
+"""
+Async Binance Client - native asyncio kline/ticker fetcher for the FastAPI scan path
+Returns the same DataFrames as CryptoForexScreener.get_crypto_klines
+"""
+
+from typing import Dict, List, Optional
+import json
+import sys
+import os
+
+import httpx
+import pandas as pd
+
+# Add the parent directory to path to import screener helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screener import klines_to_dataframe
+from rate_limiter import binance_limiter
+from kline_cache import kline_cache
+
+
+class AsyncBinanceClient:
+    """
+    Pooled httpx.AsyncClient for Binance public market data
+    Shares the process-wide binance_limiter with the synchronous screener
+    """
+
+    def __init__(self, base_url: str, http_config: Dict):
+        self.base_url = base_url
+        transport = httpx.AsyncHTTPTransport(retries=http_config["retries"])
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=http_config["pool_size"],
+                max_keepalive_connections=http_config["pool_size"]
+            ),
+            timeout=httpx.Timeout(http_config["read_timeout"], connect=http_config["connect_timeout"])
+        )
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None):
+        """GET an endpoint inside the shared request-weight budget"""
+        await binance_limiter.acquire_endpoint_async(endpoint, params)
+        response = await self.client.get(f"/{endpoint}", params=params)
+        binance_limiter.update_from_response(response)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 200,
+                         use_cache: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Get crypto candlestick data (same columns as get_crypto_klines, shares its cache)
+        use_cache comes from the scan's ScanConfig.cache_klines, like the synchronous path
+        """
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'limit': limit
+        }
+
+        if use_cache:
+            start_time = kline_cache.start_time(symbol, "CRYPTO", interval, limit)
+            if start_time is not None:
+                params['startTime'] = start_time
+
+        try:
+            data = await self._get("klines", params)
+            df = klines_to_dataframe(data)
+            if use_cache:
+                return kline_cache.merge(symbol, "CRYPTO", interval, df, limit,
+                                         incremental='startTime' in params)
+            return df
+        except Exception as e:
+            print(f"❌ Error fetching crypto data for {symbol}: {e}")
+            return None
+
+    async def get_ticker_24hr(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        """Get the 24h ticker for the given symbols in one call, or all symbols (raises on failure)"""
+        if symbols:
+            return await self._get("ticker/24hr", {"symbols": json.dumps(symbols, separators=(",", ":"))})
+        return await self._get("ticker/24hr")
+
+    async def close(self):
+        """Close pooled connections"""
+        await self.client.aclose()
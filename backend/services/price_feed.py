@@ -0,0 +1,197 @@
+"""
+Price Feed - Shared live prices for WebSocket clients
+One polling task fetches every watched symbol (all crypto symbols in a single
+ticker request) and fans the result out, so N clients watching BTCUSDT cost one
+upstream fetch. Each client keeps only the latest tick per symbol.
+With several workers only the scan leader polls upstream: the others register
+their symbols and read the leader's prices from the shared database
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Set
+import sys
+import os
+
+# Add the parent directory to path to import the API models
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models import MarketData
+from services.scanner_service import ScannerService
+from services.scan_leader import ScanLeader
+from database.scan_leader_db import watch_prices, get_watched_prices, save_live_prices, get_live_prices
+from database.followed_signals_db import FollowedSignal
+
+
+def position_events(position: FollowedSignal, price: float) -> List[str]:
+    """TP1_HIT / TP2_HIT / SL_HIT levels a followed position has reached at this price"""
+    if position.signal_type == "LONG":
+        hits = [
+            ("TP1_HIT", price >= position.take_profit1),
+            ("TP2_HIT", price >= position.take_profit2),
+            ("SL_HIT", price <= position.stop_loss)
+        ]
+    else:
+        hits = [
+            ("TP1_HIT", price <= position.take_profit1),
+            ("TP2_HIT", price <= position.take_profit2),
+            ("SL_HIT", price >= position.stop_loss)
+        ]
+    return [event for event, hit in hits if hit]
+
+
+class PriceWatcher:
+    """
+    One client's view of the feed
+    Ticks are coalesced per symbol, so a slow client gets the newest price, never a backlog
+    """
+
+    def __init__(self):
+        self.symbols: Set[str] = set()
+        self._pending: Dict[str, MarketData] = {}
+        self._ready = asyncio.Event()
+
+    def push(self, data: MarketData):
+        """Replace any unsent tick for the symbol with this one"""
+        self._pending[data.symbol] = data
+        self._ready.set()
+
+    async def next_ticks(self) -> List[MarketData]:
+        """Wait for and take every tick received since the last call"""
+        await self._ready.wait()
+        self._ready.clear()
+        ticks, self._pending = list(self._pending.values()), {}
+        return ticks
+
+
+class PriceFeed:
+    """
+    Reference-counted symbol set with a single poller
+    The poller starts with the first watched symbol and exits when none are left;
+    with a leader (set by main.py) it runs for the app's lifetime, because the
+    leader polls for the other workers' clients too
+    """
+
+    def __init__(self, scanner: ScannerService, leader: Optional[ScanLeader] = None):
+        self.scanner = scanner
+        self.leader = leader
+        self.latest: Dict[str, MarketData] = {}
+        self._watchers: Dict[str, Set[PriceWatcher]] = {}
+        self._forex_polled_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def settings(self) -> dict:
+        return self.scanner.config["price_feed"]
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._watchers)
+
+    def watch(self, watcher: PriceWatcher, symbols: Iterable[str]):
+        """Add symbols to a watcher; it gets the last known price right away"""
+        for symbol in symbols:
+            watcher.symbols.add(symbol)
+            self._watchers.setdefault(symbol, set()).add(watcher)
+            if symbol in self.latest:
+                watcher.push(self.latest[symbol])
+
+        if self._watchers:
+            self.start()
+
+    def unwatch(self, watcher: PriceWatcher, symbols: Optional[Iterable[str]] = None):
+        """Remove symbols (all of them by default) from a watcher"""
+        for symbol in list(watcher.symbols if symbols is None else symbols):
+            watcher.symbols.discard(symbol)
+            watchers = self._watchers.get(symbol)
+            if watchers is not None:
+                watchers.discard(watcher)
+                if not watchers:
+                    # Nobody watches it any more: stop fetching it and forget the stale price
+                    del self._watchers[symbol]
+                    self.latest.pop(symbol, None)
+                    self._forex_polled_at.pop(symbol, None)
+
+    def start(self):
+        """Start the poller (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the poller"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _due_symbols(self, symbols: Set[str], now: float) -> List[str]:
+        """Crypto symbols every cycle, forex pairs once per forex_poll_seconds"""
+        forex = self.scanner.forex_symbols()
+        forex_interval = self.settings.get("forex_poll_seconds", 60)
+        due = []
+        for symbol in symbols:
+            if symbol in forex:
+                polled_at = self._forex_polled_at.get(symbol)
+                if polled_at is not None and now - polled_at < forex_interval:
+                    continue
+                self._forex_polled_at[symbol] = now
+            due.append(symbol)
+        return due
+
+    def _publish(self, data: MarketData):
+        """Push a price to local watchers if it moved"""
+        previous = self.latest.get(data.symbol)
+        if previous is not None and previous.price == data.price:
+            return
+        self.latest[data.symbol] = data
+        for watcher in list(self._watchers.get(data.symbol, ())):
+            watcher.push(data)
+
+    async def _poll_upstream(self, started: float):
+        """Fetch local symbols plus (on the leader) every follower's symbols, and share them"""
+        symbols = set(self._watchers)
+        if self.leader is not None:
+            symbols.update(await get_watched_prices())
+            # Forget prices of symbols no worker watches any more
+            for symbol in [s for s in self.latest if s not in symbols]:
+                del self.latest[symbol]
+                self._forex_polled_at.pop(symbol, None)
+
+        due = self._due_symbols(symbols, started)
+        if not due:
+            return
+
+        market_data = await self.scanner.get_market_data(due, live=True)
+        for data in market_data:
+            self._publish(data)
+
+        if self.leader is not None and market_data:
+            # Forex rows are rewritten only once per forex_poll_seconds; keep them well past that
+            max_age = 3 * max(self.settings.get("poll_seconds", 2), self.settings.get("forex_poll_seconds", 60))
+            await save_live_prices([(data.symbol, data.model_dump_json()) for data in market_data], max_age)
+
+    async def _poll_shared(self, started: float):
+        """Follower: renew this worker's watches and read the leader's latest prices"""
+        symbols = list(self._watchers)
+        lease = 3 * self.settings.get("poll_seconds", 2)
+        await watch_prices(self.leader.owner, symbols, time.time() + lease)
+        for data_json in await get_live_prices(symbols):
+            self._publish(MarketData.model_validate_json(data_json))
+
+    async def _run(self):
+        while self._watchers or self.leader is not None:
+            started = time.monotonic()
+
+            try:
+                if self.leader is None or self.leader.is_leader:
+                    await self._poll_upstream(started)
+                elif self._watchers:
+                    await self._poll_shared(started)
+            except Exception as e:
+                print(f"⚠️  Price feed poll failed: {e}")
+
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.settings.get("poll_seconds", 2) - elapsed))
@@ -0,0 +1,105 @@
+"""
+Scan Cache - Coalesces identical scan requests and reuses their results
+Concurrent callers with the same ScanRequest share one scan task; the result
+is served from memory until the next candle of that timeframe closes
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import sys
+import os
+
+# Add the parent directory to path to import kline_cache
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models import ScanRequest, ScanResponse
+from kline_cache import INTERVAL_MS
+
+ScanKey = Tuple
+
+
+def scan_key(request: ScanRequest) -> ScanKey:
+    """Canonical key for a scan request (order and case of the lists do not matter)"""
+    markets = {m.upper() for m in request.market_types}
+    forex_pairs = None
+    if "FOREX" in markets and request.forex_pairs:
+        forex_pairs = tuple(sorted({p.upper() for p in request.forex_pairs}))
+
+    return (
+        tuple(sorted(markets)),
+        tuple(sorted({s.upper() for s in request.strategies})),
+        request.timeframe,
+        request.crypto_limit if "CRYPTO" in markets else None,
+        forex_pairs
+    )
+
+
+def next_candle_close(timeframe: str, now: Optional[float] = None) -> float:
+    """Epoch seconds at which the current candle of `timeframe` closes"""
+    now = time.time() if now is None else now
+    interval = INTERVAL_MS.get(timeframe, 300_000) / 1000.0
+    return (now // interval + 1) * interval
+
+
+class ScanResultCache:
+    """
+    In-flight scan tasks and finished results keyed by scan_key()
+    Only successful responses are cached
+    """
+
+    def __init__(self):
+        self._inflight: Dict[ScanKey, asyncio.Task] = {}
+        self._results: Dict[ScanKey, Tuple[float, ScanResponse]] = {}
+
+    def get(self, request: ScanRequest) -> Optional[ScanResponse]:
+        """Cached response for this request if its candle has not closed yet"""
+        key = scan_key(request)
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if time.time() >= expires_at:
+            del self._results[key]
+            return None
+        return response
+
+    def store(self, request: ScanRequest, response: ScanResponse, expires_at: Optional[float] = None):
+        """Keep a successful response until the next candle close (or expires_at)"""
+        if response.success:
+            if expires_at is None:
+                expires_at = next_candle_close(request.timeframe)
+            self._results[scan_key(request)] = (expires_at, response)
+
+    async def get_or_scan(self, request: ScanRequest,
+                          scan: Callable[[ScanRequest], Awaitable[ScanResponse]]) -> Tuple[ScanResponse, bool]:
+        """
+        Return (response, fresh)
+        fresh is True only for the caller whose request actually ran the scan,
+        so signals are persisted once per scan rather than once per client
+        """
+        cached = self.get(request)
+        if cached is not None:
+            return cached, False
+
+        key = scan_key(request)
+        task = self._inflight.get(key)
+        if task is not None:
+            # shield: a disconnecting client must not cancel the scan other clients wait on
+            return await asyncio.shield(task), False
+
+        async def run() -> ScanResponse:
+            try:
+                response = await scan(request)
+                self.store(request, response)
+                return response
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return await asyncio.shield(task), True
+
+    def clear(self):
+        """Forget cached results (in-flight scans keep running)"""
+        self._results.clear()
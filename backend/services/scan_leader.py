@@ -0,0 +1,70 @@
+"""
+Scan Leader - Elects one uvicorn worker to run scheduled scans
+Workers compete for a lease row in the shared SQLite database; the holder renews
+it on a heartbeat and another worker takes over once the lease goes stale
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from typing import Optional
+import sys
+
+# Add the parent directory to path to import the database helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.scan_leader_db import acquire_scan_lease, release_scan_lease
+
+
+class ScanLeader:
+    """
+    Heartbeat loop holding (or waiting for) the leader lease
+    is_leader is False until the first successful renewal
+    """
+
+    def __init__(self, lease_seconds: float = 30, heartbeat_seconds: float = 10):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the heartbeat loop (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop heartbeating and release the lease if we hold it"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                await release_scan_lease(self.owner)
+            except Exception as e:
+                print(f"⚠️  Could not release scan leader lease: {e}")
+
+    async def _run(self):
+        while True:
+            try:
+                leader = await acquire_scan_lease(self.owner, self.lease_seconds)
+            except Exception as e:
+                print(f"⚠️  Scan leader heartbeat failed: {e}")
+                leader = False
+
+            if leader != self.is_leader:
+                if leader:
+                    print(f"👑 Worker {self.owner} is now the scan leader")
+                else:
+                    print(f"👥 Worker {self.owner} is no longer the scan leader")
+                self.is_leader = leader
+
+            await asyncio.sleep(self.heartbeat_seconds)
@@ -0,0 +1,156 @@
+"""
+Scan Scheduler - Background scans aligned to candle closes
+Runs inside the FastAPI lifespan: scans each configured timeframe right after
+its candle closes, saves the signals and leaves the result in the scan cache
+so /scan/single requests with the same settings are served without scanning
+On the scan leader it also runs the scans other workers queued in the shared store
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Add the parent directory to path to import the database helpers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models import ScanRequest
+from services.scanner_service import ScannerService
+from services.scan_cache import next_candle_close
+from services.scan_leader import ScanLeader
+from database.scan_leader_db import get_scan_requests, delete_scan_request
+
+
+class ScanScheduler:
+    """
+    Single asyncio task that sleeps until the next candle close (+ grace delay)
+    Settings are re-read every cycle, so PUT /config takes effect on the next candle
+    With a leader, only the worker holding the lease scans; the others serve its shared results
+    """
+
+    def __init__(self, scanner: ScannerService, leader: Optional[ScanLeader] = None):
+        self.scanner = scanner
+        self.leader = leader
+        self._task: Optional[asyncio.Task] = None
+        self._requests_task: Optional[asyncio.Task] = None
+        self._serving: Dict[str, asyncio.Task] = {}
+        self.last_run: Optional[str] = None
+
+    @property
+    def settings(self) -> dict:
+        return self.scanner.config["scanning"]
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.get("auto_scan_enabled", False)
+
+    def timeframes(self) -> List[str]:
+        """Timeframes to scan, defaults to the configured scan timeframe"""
+        return self.settings.get("auto_scan_timeframes") or [self.settings["timeframe"]]
+
+    def build_request(self, timeframe: str) -> ScanRequest:
+        """ScanRequest for the configured markets, same shape the Android app sends"""
+        market_types = []
+        if self.settings["scan_crypto"]:
+            market_types.append("CRYPTO")
+        if self.settings["scan_forex"]:
+            market_types.append("FOREX")
+
+        return ScanRequest(
+            market_types=market_types,
+            strategies=self.settings["active_strategies"],
+            timeframe=timeframe,
+            crypto_limit=self.settings["crypto_top_coins"],
+            # The app sends null (the screener's full forex list); a pair list would be another scan key
+            forex_pairs=None
+        )
+
+    def start(self):
+        """Start the background loops (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        if self.leader is not None and (self._requests_task is None or self._requests_task.done()):
+            self._requests_task = asyncio.create_task(self._serve_requests())
+
+    async def stop(self):
+        """Cancel the background loops and requested scans, and wait for them to exit"""
+        tasks = [self._task, self._requests_task] + list(self._serving.values())
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+        for task in tasks:
+            if task is not None:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._requests_task = None
+        self._serving.clear()
+
+    async def _run(self):
+        while True:
+            timeframes = self.timeframes()
+            grace = self.settings.get("auto_scan_grace_seconds", 5)
+
+            # Wake up just after the earliest upcoming candle close
+            close_at = min(next_candle_close(tf) for tf in timeframes)
+            await asyncio.sleep(max(0.0, close_at + grace - time.time()))
+
+            if not self.enabled:
+                continue
+            if self.leader is not None and not self.leader.is_leader:
+                continue
+
+            # Every timeframe whose candle closed at close_at (e.g. 5m and 15m on the quarter hour)
+            due = [tf for tf in timeframes if next_candle_close(tf, close_at - 1) == close_at]
+            for timeframe in due:
+                await self.scan_timeframe(timeframe)
+
+    async def scan_timeframe(self, timeframe: str):
+        """Scan one timeframe now (a new scan queues its own signals)"""
+        try:
+            request = self.build_request(timeframe)
+            if not request.market_types or not request.strategies:
+                return
+
+            print(f"⏰ Scheduled scan: {timeframe} {request.market_types}")
+            response, _ = await self.scanner.get_or_scan(request)
+
+            self.last_run = response.timestamp
+            print(f"✅ Scheduled scan complete: {len(response.signals)} signals ({timeframe})")
+        except Exception as e:
+            print(f"❌ Scheduled scan error ({timeframe}): {e}")
+
+    async def _serve_requests(self):
+        """Leader only: pick up scans requested by other workers"""
+        while True:
+            await asyncio.sleep(self.settings.get("scan_poll_seconds", 0.5))
+            if not self.leader.is_leader:
+                continue
+
+            try:
+                pending = await get_scan_requests(self.settings.get("scan_wait_seconds", 120))
+            except Exception as e:
+                print(f"⚠️  Could not read scan requests: {e}")
+                continue
+
+            for key, request_json in pending:
+                if key not in self._serving:
+                    self._serving[key] = asyncio.create_task(self._serve_request(key, request_json))
+
+    async def _serve_request(self, key: str, request_json: str):
+        """Run one requested scan; the requester reads the result from the shared store"""
+        try:
+            request = ScanRequest.model_validate_json(request_json)
+            response, _ = await self.scanner.get_or_scan(request)
+            print(f"📨 Requested scan served: {len(response.signals)} signals ({request.timeframe})")
+        except Exception as e:
+            print(f"❌ Requested scan error: {e}")
+        finally:
+            self._serving.pop(key, None)
+            try:
+                await delete_scan_request(key)
+            except Exception as e:
+                print(f"⚠️  Could not clear scan request: {e}")
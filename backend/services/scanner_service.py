@@ -4,7 +4,11 @@ Provides async interface for the FastAPI backend
 """
 
 import asyncio
-from typing import List, Optional
+import copy
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import time
 import sys
@@ -15,6 +19,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.models import ScanRequest, ScanResponse, Signal, MarketData, UserConfig
 from screener_wrapper import CryptoForexScreener
+from ticker_snapshot import TickerSnapshot
+from scan_config import ScanConfig
+from screener import evaluate_strategies, init_strategy_process, klines_to_payload
+from services.scan_cache import ScanResultCache, scan_key, next_candle_close
+from services.ticker_cache import TickerCache
+from services.scan_leader import ScanLeader
+from database.scan_leader_db import get_scan_result, save_scan_result, request_scan
+from database.db import get_db_signal, get_db_signals, queue_signals, row_to_signal
+
+# Native asyncio Binance client (optional, scans fall back to the thread pool)
+ASYNC_CLIENT_AVAILABLE = False
+try:
+    from services.binance_client import AsyncBinanceClient
+    ASYNC_CLIENT_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  Async Binance client unavailable ({e}), using thread pool scans")
+    print("💡 Run: pip install httpx")
+
+# How long a failed scan result stays in the shared store
+FAILED_SCAN_SHARE_SECONDS = 10
 
 class ScannerService:
     """
@@ -22,10 +46,48 @@ class ScannerService:
     Provides async methods for the API
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.screener = None
         self.config = None
         self._initialize_screener()
+        
+        # Bounded pool for concurrent symbol scans
+        # The request budget is enforced per HTTP call by the shared limiters in rate_limiter.py
+        self.max_workers = max_workers or self.config["scanning"].get("max_workers", 8)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scan")
+        
+        # Optional worker processes for the CPU-bound strategy stage (the GIL serializes it in threads)
+        # spawn: forking a process that already runs threads and an event loop is unsafe
+        self.process_pool = None
+        process_workers = self.config["scanning"].get("process_workers", 0)
+        if process_workers > 0:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_strategy_process,
+                initargs=(copy.deepcopy(self.config),)
+            )
+        
+        # Created lazily inside the running event loop
+        self.async_client = None
+        
+        # Identical requests share one scan; results live until the next candle close
+        self.results = ScanResultCache()
+        
+        # Identical requests waiting on the scan leader share one wait
+        self.pending = ScanResultCache()
+        
+        # Set by main.py for multi-worker deployments: only the lease holder scans
+        self.leader: Optional[ScanLeader] = None
+        
+        # Parsed 24h ticker shared by top-coin selection and the market data endpoints
+        self.tickers = TickerCache(
+            self._get_crypto_tickers,
+            refresh_seconds=self.config["scanning"].get("ticker_refresh_seconds", 15)
+        )
+        
+        # Symbols Binance rejected; kept out of batched ticker requests for good
+        self.bad_symbols: Set[str] = set()
     
     def _initialize_screener(self):
         """Initialize the screener with default config"""
@@ -37,6 +99,86 @@ class ScannerService:
             print(f"❌ Failed to initialize screener: {e}")
             raise
     
+    async def get_or_scan(self, request: ScanRequest) -> Tuple[ScanResponse, bool]:
+        """
+        Serve a scan from the result cache, the result another worker shared this candle,
+        join an identical scan already running, or start a new one
+        A worker that is not the scan leader never scans: it asks the leader and waits
+        Returns (response, fresh); fresh is True when this call ran the scan
+        Signals from a new scan are queued for the database by the scan itself
+        """
+        cached = self.results.get(request)
+        if cached is not None:
+            return cached, False
+        
+        shared = await self._load_shared_result(request)
+        if shared is not None:
+            return shared, False
+        
+        if self.leader is not None and not self.leader.is_leader:
+            # The leader runs the scan and saves its signals
+            response, _ = await self.pending.get_or_scan(request, self._wait_for_leader)
+            return response, False
+        
+        return await self.results.get_or_scan(request, self._scan_and_share)
+    
+    async def _load_shared_result(self, request: ScanRequest) -> Optional[ScanResponse]:
+        """Scan response stored by any worker (usually the scan leader) for this candle"""
+        try:
+            row = await get_scan_result(json.dumps(scan_key(request)))
+            if row is None:
+                return None
+            response_json, expires_at = row
+            response = ScanResponse.model_validate_json(response_json)
+            self.results.store(request, response, expires_at)
+            return response
+        except Exception as e:
+            print(f"⚠️  Shared scan result unavailable: {e}")
+            return None
+    
+    async def _wait_for_leader(self, request: ScanRequest) -> ScanResponse:
+        """Queue the scan for the leader and poll the shared store for its result"""
+        settings = self.config["scanning"]
+        started = time.time()
+        
+        await request_scan(json.dumps(scan_key(request)), request.model_dump_json())
+        while time.time() - started < settings.get("scan_wait_seconds", 120):
+            await asyncio.sleep(settings.get("scan_poll_seconds", 0.5))
+            shared = await self._load_shared_result(request)
+            if shared is not None:
+                return shared
+        
+        return ScanResponse(
+            success=False,
+            signals=[],
+            scan_time=round(time.time() - started, 2),
+            total_symbols_scanned=0,
+            timestamp=datetime.now().isoformat(),
+            message="Scan failed: timed out waiting for the scan leader"
+        )
+    
+    async def _scan_and_share(self, request: ScanRequest) -> ScanResponse:
+        """
+        Run a scan, queue its signals and publish the result to the other workers
+        Runs as the shared scan task, so the signals are saved even if the requester goes away
+        A failed scan is shared briefly so waiting workers get the error instead of timing out
+        """
+        response = await self.perform_scan(request)
+        if response.signals:
+            queue_signals(response.signals)
+        expires_at = next_candle_close(request.timeframe)
+        if not response.success:
+            expires_at = min(expires_at, time.time() + FAILED_SCAN_SHARE_SECONDS)
+        try:
+            await save_scan_result(
+                json.dumps(scan_key(request)),
+                response.model_dump_json(by_alias=True),
+                expires_at
+            )
+        except Exception as e:
+            print(f"⚠️  Could not share scan result: {e}")
+        return response
+    
     async def perform_scan(self, request: ScanRequest) -> ScanResponse:
         """
         Perform a scan based on the request parameters
@@ -45,16 +187,26 @@ class ScannerService:
         start_time = time.time()
         
         try:
-            # Update screener config based on request
-            self._update_screener_config(request)
+            # Settings for this scan only; the shared screener config is never modified
+            scan_config = self.screener.get_scan_config(timeframe=request.timeframe)
             
-            # Run scan in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            signals = await loop.run_in_executor(
-                None,
-                self._run_scan,
-                request
-            )
+            if ASYNC_CLIENT_AVAILABLE:
+                # Crypto fetches run as concurrent coroutines on the event loop
+                signals = await self._run_scan_async(request, scan_config)
+            else:
+                crypto_symbols = []
+                if "CRYPTO" in request.market_types:
+                    crypto_symbols = await self._get_crypto_symbols_async(request.crypto_limit)
+                
+                # Run scan in executor to avoid blocking
+                loop = asyncio.get_event_loop()
+                signals = await loop.run_in_executor(
+                    None,
+                    self._run_scan,
+                    request,
+                    scan_config,
+                    crypto_symbols
+                )
             
             scan_time = time.time() - start_time
             
@@ -88,67 +240,127 @@ class ScannerService:
                 message=f"Scan failed: {str(e)}"
             )
     
-    def _update_screener_config(self, request: ScanRequest):
-        """Update screener configuration based on scan request"""
-        self.screener.config["scanning"]["scan_crypto"] = "CRYPTO" in request.market_types
-        self.screener.config["scanning"]["scan_forex"] = "FOREX" in request.market_types
-        self.screener.config["scanning"]["active_strategies"] = request.strategies
-        self.screener.config["scanning"]["timeframe"] = request.timeframe
-        self.screener.config["scanning"]["crypto_top_coins"] = request.crypto_limit
-        
-        if request.forex_pairs:
-            self.screener.config["scanning"]["forex_pairs"] = request.forex_pairs
-    
-    def _run_scan(self, request: ScanRequest) -> List[dict]:
+    def _run_scan(self, request: ScanRequest, scan_config: ScanConfig, crypto_symbols: List[str]) -> List[dict]:
         """
         Run the actual scan (synchronous)
         This runs in a separate thread via run_in_executor
+        Symbols are scanned concurrently on the worker pool; results keep symbol order
         """
         all_signals = []
         
-        # Get symbols to scan
+        # Get symbols to scan (crypto_symbols come from the shared ticker snapshot)
+        forex_symbols = []
+        
+        if "FOREX" in request.market_types:
+            forex_symbols = request.forex_pairs if request.forex_pairs else self.screener.get_forex_pairs()
+        
+        # Crypto first, then forex (klines fetched once per symbol, shared by all strategies)
+        jobs = [(symbol, "CRYPTO") for symbol in crypto_symbols]
+        jobs += [(symbol, "FOREX") for symbol in forex_symbols]
+        
+        if self.process_pool is not None:
+            # Threads fetch, worker processes evaluate each symbol as soon as its candles arrive
+            frames = self.executor.map(
+                lambda job: self.screener.get_strategy_klines(job[0], job[1], request.strategies, scan_config),
+                jobs
+            )
+            futures = [
+                self.process_pool.submit(
+                    evaluate_strategies, symbol, market_type, request.strategies,
+                    klines_to_payload(df), scan_config
+                )
+                for (symbol, market_type), df in zip(jobs, frames)
+            ]
+            results = (future.result() for future in futures)
+        else:
+            # map() yields in submission order, so output order matches the sequential scan
+            results = self.executor.map(
+                lambda job: self.screener.scan_symbol(job[0], job[1], request.strategies, scan_config),
+                jobs
+            )
+        
+        for signals in results:
+            all_signals.extend(signals)
+        
+        return all_signals
+    
+    def _get_async_client(self) -> "AsyncBinanceClient":
+        """Create the pooled async client on first use"""
+        if self.async_client is None:
+            self.async_client = AsyncBinanceClient(
+                self.screener.crypto_base_url,
+                self.config["http"]
+            )
+        return self.async_client
+    
+    async def _get_crypto_symbols_async(self, limit: int) -> List[str]:
+        """Top crypto coins by volume from the shared ticker snapshot"""
+        try:
+            snapshot = await self.tickers.get()
+            return snapshot.top_usdt(limit, self.config["scanning"]["min_volume"])
+        except Exception as e:
+            print(f"❌ Error fetching crypto list: {e}")
+            return self.screener.get_default_crypto_coins()
+    
+    async def _run_scan_async(self, request: ScanRequest, scan_config: ScanConfig) -> List[dict]:
+        """
+        Run the scan on the event loop
+        Crypto klines come from the async client; forex (yfinance) and strategy
+        evaluation run on the worker pool. A semaphore bounds symbols in flight
+        and gather() keeps results in symbol order
+        """
+        loop = asyncio.get_running_loop()
+        client = self._get_async_client()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        bars = self.screener.required_bars(request.strategies)
+        
         crypto_symbols = []
         forex_symbols = []
         
         if "CRYPTO" in request.market_types:
-            crypto_symbols = self.screener.get_crypto_top_coins(request.crypto_limit)
+            crypto_symbols = await self._get_crypto_symbols_async(request.crypto_limit)
         
         if "FOREX" in request.market_types:
             forex_symbols = request.forex_pairs if request.forex_pairs else self.screener.get_forex_pairs()
         
-        # Scan crypto
-        if crypto_symbols:
-            for symbol in crypto_symbols:
-                for strategy in request.strategies:
-                    signal = None
-                    
-                    if strategy == "SAR_SMA":
-                        signal = self.screener.check_sar_sma_strategy(symbol, "CRYPTO")
-                    elif strategy == "SUPERTREND_MA":
-                        signal = self.screener.check_supertrend_ma_strategy(symbol, "CRYPTO")
-                    
-                    if signal:
-                        all_signals.append(signal)
-                
-                time.sleep(0.05)  # Rate limiting
-        
-        # Scan forex
-        if forex_symbols:
-            for symbol in forex_symbols:
-                for strategy in request.strategies:
-                    signal = None
-                    
-                    if strategy == "SAR_SMA":
-                        signal = self.screener.check_sar_sma_strategy(symbol, "FOREX")
-                    elif strategy == "SUPERTREND_MA":
-                        signal = self.screener.check_supertrend_ma_strategy(symbol, "FOREX")
-                    
-                    if signal:
-                        all_signals.append(signal)
-                
-                time.sleep(0.05)  # Rate limiting
+        async def scan_one(symbol: str, market_type: str) -> List[dict]:
+            async with semaphore:
+                if not bars:
+                    return []
+                if market_type == "CRYPTO":
+                    df = await client.get_klines(symbol, scan_config.timeframe, bars,
+                                                 use_cache=scan_config.cache_klines)
+                else:
+                    df = await loop.run_in_executor(
+                        self.executor, self.screener.get_strategy_klines,
+                        symbol, market_type, request.strategies, scan_config
+                    )
+            
+            if self.process_pool is not None:
+                return await loop.run_in_executor(
+                    self.process_pool, evaluate_strategies,
+                    symbol, market_type, request.strategies, klines_to_payload(df), scan_config
+                )
+            return await loop.run_in_executor(
+                self.executor, self.screener.run_strategies,
+                symbol, market_type, request.strategies, df, scan_config
+            )
         
-        return all_signals
+        # Crypto first, then forex, same order as the synchronous scan
+        jobs = [scan_one(symbol, "CRYPTO") for symbol in crypto_symbols]
+        jobs += [scan_one(symbol, "FOREX") for symbol in forex_symbols]
+        results = await asyncio.gather(*jobs)
+        
+        return [signal for signals in results for signal in signals]
+    
+    async def close(self):
+        """Release pooled connections, worker threads and worker processes"""
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+        self.executor.shutdown(wait=False)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
     
     def _convert_to_signal_model(self, signal_dict: dict) -> Signal:
         """Convert screener signal dict to Signal model"""
@@ -182,33 +394,152 @@ class ScannerService:
     
     async def get_signal_by_id(self, signal_id: int) -> Optional[Signal]:
         """Get a signal by ID from database"""
-        # TODO: Implement database query
-        return None
+        row = await get_db_signal(signal_id)
+        return row_to_signal(row) if row else None
+    
+    async def get_signals_since(
+        self, cutoff_time: datetime, limit: int = 100, before_id: Optional[int] = None
+    ) -> List[Signal]:
+        """Get signals since a specific time, newest first"""
+        rows = await get_db_signals(limit=limit, before_id=before_id, since=cutoff_time.isoformat())
+        return [row_to_signal(row) for row in rows]
+    
+    async def get_signals_by_market(
+        self, market_type: str, limit: int = 100, before_id: Optional[int] = None
+    ) -> List[Signal]:
+        """Get signals filtered by market type, newest first"""
+        rows = await get_db_signals(limit=limit, before_id=before_id, market_type=market_type)
+        return [row_to_signal(row) for row in rows]
+    
+    async def get_signals_by_strategy(
+        self, strategy: str, limit: int = 100, before_id: Optional[int] = None
+    ) -> List[Signal]:
+        """Get signals filtered by strategy, newest first"""
+        rows = await get_db_signals(limit=limit, before_id=before_id, strategy=strategy)
+        return [row_to_signal(row) for row in rows]
     
-    async def get_signals_since(self, cutoff_time: datetime) -> List[Signal]:
-        """Get signals since a specific time"""
-        # TODO: Implement database query
-        return []
+    def forex_symbols(self) -> Set[str]:
+        """Every forex symbol the config knows about; anything else is treated as crypto"""
+        forex_config = self.config["forex_config"]
+        return set(
+            self.config["scanning"]["forex_pairs"]
+            + forex_config["major_pairs"]
+            + forex_config["commodities"]
+            + forex_config["exotic_pairs"]
+        )
+    
+    async def split_known_symbols(self, symbols: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split symbols into (known, unknown): forex pairs from the config and crypto
+        symbols listed in the shared ticker snapshot are known
+        Raises if the snapshot cannot be loaded
+        """
+        forex = self.forex_symbols()
+        snapshot = await self.tickers.get()
+        known, unknown = [], []
+        for symbol in symbols:
+            if symbol in forex or (symbol in snapshot and symbol not in self.bad_symbols):
+                known.append(symbol)
+            else:
+                unknown.append(symbol)
+        return known, unknown
     
-    async def get_signals_by_market(self, market_type: str) -> List[Signal]:
-        """Get signals filtered by market type"""
-        # TODO: Implement database query
-        return []
+    def _snapshot_market_data(self, snapshot: TickerSnapshot, symbols: List[str]) -> List[MarketData]:
+        """MarketData for the symbols present in a ticker snapshot"""
+        rows = (snapshot.row(symbol) for symbol in symbols)
+        return [MarketData(market_type="CRYPTO", **row) for row in rows if row is not None]
     
-    async def get_signals_by_strategy(self, strategy: str) -> List[Signal]:
-        """Get signals filtered by strategy"""
-        # TODO: Implement database query
-        return []
+    def _get_forex_market_data(self, symbol: str) -> Optional[MarketData]:
+        """24h figures for a forex pair from its last 24 hourly candles (synchronous)"""
+        df = self.screener.get_forex_klines(symbol, "1h", 24)
+        if df is None or df.empty:
+            return None
+        
+        close = float(df["close"].iloc[-1])
+        open_24h = float(df["open"].iloc[0])
+        return MarketData(
+            symbol=symbol,
+            market_type="FOREX",
+            price=close,
+            price_change_24h=close - open_24h,
+            price_change_percent_24h=(close - open_24h) / open_24h * 100 if open_24h else 0.0,
+            volume_24h=float(df["volume"].sum()),
+            high_24h=float(df["high"].max()),
+            low_24h=float(df["low"].min()),
+            last_update_time=int(df["timestamp"].iloc[-1])
+        )
+    
+    async def _get_crypto_tickers(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        """24h tickers for symbols (all when None), one upstream request"""
+        if ASYNC_CLIENT_AVAILABLE:
+            return await self._get_async_client().get_ticker_24hr(symbols)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.screener.get_crypto_tickers, symbols)
+    
+    async def _get_crypto_market_data(self, symbols: List[str], live: bool = False) -> List[MarketData]:
+        """
+        Crypto market data from the ticker snapshot, or live from batched tickers
+        If Binance rejects a live batch, ask per symbol once and remember the
+        symbols it rejects so they never break a batch again
+        """
+        if not live:
+            return self._snapshot_market_data(await self.tickers.get(), symbols)
+        
+        symbols = [s for s in symbols if s not in self.bad_symbols]
+        if not symbols:
+            return []
+        
+        try:
+            snapshot = TickerSnapshot(await self._get_crypto_tickers(symbols))
+            return self._snapshot_market_data(snapshot, symbols)
+        except Exception as e:
+            if len(symbols) == 1:
+                # 400 means Binance does not know the symbol; anything else may be transient
+                if getattr(getattr(e, "response", None), "status_code", None) == 400:
+                    self.bad_symbols.add(symbols[0])
+                    print(f"⚠️  Binance rejected {symbols[0]}, dropping it from live tickers")
+                else:
+                    print(f"❌ Error fetching ticker for {symbols[0]}: {e}")
+                return []
+        
+        results = await asyncio.gather(*[self._get_crypto_market_data([s], live=True) for s in symbols])
+        return [data for found in results for data in found]
     
-    async def get_market_data(self, symbols: Optional[List[str]] = None) -> List[MarketData]:
-        """Get current market data for symbols"""
-        # TODO: Implement market data fetching
-        return []
+    async def get_market_data(self, symbols: Optional[List[str]] = None, live: bool = False) -> List[MarketData]:
+        """
+        Get current market data for symbols (the configured top coins when None)
+        Crypto comes from the shared ticker snapshot, or with live=True from one batched
+        request for just these symbols; forex pairs run on the worker pool
+        """
+        if not symbols:
+            snapshot = await self.tickers.get()
+            scanning = self.config["scanning"]
+            return self._snapshot_market_data(
+                snapshot, snapshot.top_usdt(scanning["crypto_top_coins"], scanning["min_volume"])
+            )
+        
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        forex = self.forex_symbols()
+        crypto_symbols = [s for s in symbols if s not in forex]
+        forex_symbols = [s for s in symbols if s in forex]
+        
+        loop = asyncio.get_running_loop()
+        jobs = [loop.run_in_executor(self.executor, self._get_forex_market_data, s) for s in forex_symbols]
+        if crypto_symbols:
+            jobs.append(self._get_crypto_market_data(crypto_symbols, live))
+        
+        market_data = []
+        for result in await asyncio.gather(*jobs):
+            if isinstance(result, list):
+                market_data.extend(result)
+            elif result is not None:
+                market_data.append(result)
+        return market_data
     
     async def get_current_price(self, symbol: str) -> Optional[MarketData]:
         """Get current price for a symbol"""
-        # TODO: Implement price fetching
-        return None
+        market_data = await self.get_market_data([symbol])
+        return market_data[0] if market_data else None
     
     async def get_config(self) -> UserConfig:
         """Get current user configuration"""
@@ -221,7 +552,7 @@ class ScannerService:
             "crypto_top_coins": self.config["scanning"]["crypto_top_coins"],
             "forex_pairs": self.config["scanning"]["forex_pairs"],
             "notifications_enabled": True,
-            "auto_scan_enabled": False
+            "auto_scan_enabled": self.config["scanning"].get("auto_scan_enabled", False)
         })
     
     async def update_config(self, config: UserConfig) -> UserConfig:
@@ -233,6 +564,7 @@ class ScannerService:
         self.config["scanning"]["timeframe"] = config.timeframe
         self.config["scanning"]["crypto_top_coins"] = config.crypto_top_coins
         self.config["scanning"]["forex_pairs"] = config.forex_pairs
+        self.config["scanning"]["auto_scan_enabled"] = config.auto_scan_enabled
         
         # Save to file
         self.screener.update_config(self.config)
@@ -0,0 +1,158 @@
+"""
+Signal Hub - Broadcast of newly saved signals to /signals/stream clients
+While anyone is subscribed, one task per worker tails the signals table by id, so
+signals saved by any worker (usually the scan leader) reach every worker's clients.
+Every client holds a small bounded queue, and a slow client loses its oldest
+signals instead of holding up the tail or growing memory
+"""
+
+import asyncio
+from typing import Iterable, List, Optional, Set
+import sys
+import os
+
+# Add the parent directory to path to import the API models
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.models import Signal
+from database.db import get_last_signal_id, get_signals_after
+
+# Signals buffered per subscriber before the oldest are dropped
+DEFAULT_QUEUE_SIZE = 256
+
+# How often the tail looks for new rows, and the most it reads per look
+TAIL_POLL_SECONDS = 1.0
+TAIL_BATCH = 500
+
+
+class Subscription:
+    """
+    One stream client: its filters and its bounded queue
+    dropped counts signals discarded since the client last read
+    """
+
+    def __init__(
+        self,
+        market_types: Optional[Set[str]] = None,
+        strategies: Optional[Set[str]] = None,
+        symbols: Optional[Set[str]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ):
+        self.market_types = market_types
+        self.strategies = strategies
+        self.symbols = symbols
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def matches(self, signal: Signal) -> bool:
+        """True if the signal passes every filter set on this subscription"""
+        if self.market_types and signal.market_type not in self.market_types:
+            return False
+        if self.strategies and signal.strategy not in self.strategies:
+            return False
+        if self.symbols and signal.symbol not in self.symbols:
+            return False
+        return True
+
+    def offer(self, signal: Signal):
+        """Enqueue without blocking, evicting the oldest signal when full"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(signal)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Signal]:
+        """Next signal, or None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def take_dropped(self) -> int:
+        """Dropped count since the last call (and reset it)"""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class SignalHub:
+    """
+    Fan-out of saved signals to stream subscribers in this worker
+    The tail starts with the first subscriber at the newest saved id and exits with the last
+    publish() is synchronous and never waits on a subscriber
+    """
+
+    def __init__(self, poll_seconds: float = TAIL_POLL_SECONDS):
+        self._subscriptions: Set[Subscription] = set()
+        self.poll_seconds = poll_seconds
+        self.last_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        market_types: Optional[Iterable[str]] = None,
+        strategies: Optional[Iterable[str]] = None,
+        symbols: Optional[Iterable[str]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE
+    ) -> Subscription:
+        """Register a subscriber; empty filters match everything"""
+        subscription = Subscription(
+            set(market_types) if market_types else None,
+            set(strategies) if strategies else None,
+            set(symbols) if symbols else None,
+            queue_size
+        )
+        self._subscriptions.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._tail())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a subscriber"""
+        self._subscriptions.discard(subscription)
+
+    def publish(self, signals: List[Signal]):
+        """Deliver a batch of saved signals to every matching subscriber"""
+        if not self._subscriptions:
+            return
+        for subscription in list(self._subscriptions):
+            for signal in signals:
+                if subscription.matches(signal):
+                    subscription.offer(signal)
+
+    async def stop(self):
+        """Cancel the tail"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _tail(self):
+        """Publish rows saved after last_id until the last subscriber leaves"""
+        self.last_id = None
+        while self._subscriptions:
+            try:
+                if self.last_id is None:
+                    # Subscribers get signals saved from now on, not the history
+                    self.last_id = await get_last_signal_id()
+                else:
+                    signals = await get_signals_after(self.last_id, TAIL_BATCH)
+                    if signals:
+                        self.last_id = signals[-1].id
+                        self.publish(signals)
+                        if len(signals) == TAIL_BATCH:
+                            # More rows are waiting; read them without sleeping
+                            continue
+            except Exception as e:
+                print(f"⚠️  Signal stream tail failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+
+# Process-wide hub used by the stream endpoint
+signal_hub = SignalHub()
@@ -0,0 +1,131 @@
+"""
+Ticker Cache - TTL cache of the parsed 24h ticker snapshot
+One background task keeps the snapshot fresh while something is reading it;
+an idle worker stops downloading the full ticker until the next read
+With several workers only the scan leader downloads; the others read its payload
+from the shared database
+"""
+
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+import sys
+import os
+
+# Add the parent directory to path to import ticker_snapshot
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ticker_snapshot import TickerSnapshot
+from services.scan_leader import ScanLeader
+from database.scan_leader_db import save_shared_tickers, get_shared_tickers, get_tickers_wanted_at
+
+
+class TickerCache:
+    """
+    get() returns the cached snapshot while it is younger than refresh_seconds,
+    otherwise joins a single in-flight download
+    A failed refresh keeps serving the previous snapshot
+    leader (set by main.py) makes every worker but the lease holder read the shared payload
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[List[Dict]]], refresh_seconds: float = 15,
+                 leader: Optional[ScanLeader] = None):
+        self._fetch = fetch
+        self.refresh_seconds = refresh_seconds
+        self.leader = leader
+        self.snapshot: Optional[TickerSnapshot] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_read = 0.0
+
+    @property
+    def is_source(self) -> bool:
+        """True when this worker downloads the ticker itself"""
+        return self.leader is None or self.leader.is_leader
+
+    def is_fresh(self) -> bool:
+        return self.snapshot is not None and self.snapshot.age < self.refresh_seconds
+
+    async def get(self) -> TickerSnapshot:
+        """Current snapshot, downloading it first if missing or expired"""
+        self._last_read = time.monotonic()
+        if self.is_fresh():
+            return self.snapshot
+        return await self.refresh()
+
+    async def refresh(self) -> TickerSnapshot:
+        """Download a new snapshot (concurrent callers share one request)"""
+        if self._loading is None or self._loading.done():
+            self._loading = asyncio.create_task(self._load())
+        try:
+            # shield: a caller giving up must not cancel the download for the others
+            return await asyncio.shield(self._loading)
+        except Exception as e:
+            if self.snapshot is None:
+                raise
+            print(f"⚠️  Ticker refresh failed, serving {self.snapshot.age:.0f}s old snapshot: {e}")
+            return self.snapshot
+
+    async def _load(self) -> TickerSnapshot:
+        if not self.is_source:
+            self.snapshot = await self._load_shared()
+            return self.snapshot
+
+        tickers = await self._fetch()
+        self.snapshot = TickerSnapshot(tickers)
+        if self.leader is not None:
+            try:
+                await save_shared_tickers(json.dumps(tickers), self.snapshot.fetched_at)
+            except Exception as e:
+                print(f"⚠️  Could not share ticker snapshot: {e}")
+        return self.snapshot
+
+    async def _load_shared(self) -> TickerSnapshot:
+        """Newest payload the leader shared; waits up to refresh_seconds only for the first one"""
+        newer_than = self.snapshot.fetched_at if self.snapshot is not None else 0
+        deadline = time.monotonic() + self.refresh_seconds
+        while True:
+            row = await get_shared_tickers(newer_than)
+            if row is not None:
+                payload, fetched_at = row
+                return TickerSnapshot(json.loads(payload), fetched_at)
+            if self.snapshot is not None:
+                # Nothing newer yet; reading stamped wanted_at, so the leader refreshes shortly
+                return self.snapshot
+            if time.monotonic() >= deadline:
+                raise RuntimeError("no ticker snapshot from the scan leader yet")
+            await asyncio.sleep(1)
+
+    async def _is_wanted(self) -> bool:
+        """Something read the snapshot recently, here or (on the leader) in another worker"""
+        window = 2 * self.refresh_seconds
+        if time.monotonic() - self._last_read < window:
+            return True
+        return self.leader is not None and time.time() - await get_tickers_wanted_at() < window
+
+    def start(self):
+        """Start the background refresh loop (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background refresh loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            # Refresh ahead of expiry, only on the downloading worker and only while the snapshot is read
+            try:
+                due = self.snapshot is None or self.snapshot.age >= self.refresh_seconds * 0.8
+                if due and self.is_source and await self._is_wanted():
+                    await self.refresh()
+            except Exception as e:
+                print(f"⚠️  Ticker refresh failed: {e}")
+            await asyncio.sleep(min(1.0, self.refresh_seconds * 0.8))
@@ -0,0 +1,304 @@
+"""
+Streaming Indicators - O(1) per-candle state for SMA, EMA, ATR, SAR and SuperTrend MA
+Feed closed candles with update(); evaluate the forming candle with peek() without committing it
+"""
+
+import copy
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+NAN = float('nan')
+
+
+# ===============================
+# BASIC INDICATORS
+# ===============================
+
+class RollingMean:
+    """Simple moving average over a fixed window, compensated running sum"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def _add(self, value: float):
+        y = value - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+    def update(self, value: float) -> float:
+        """Add one value, return the mean (NaN until the window is full)"""
+        self.window.append(value)
+        self._add(value)
+        if len(self.window) > self.period:
+            self._add(-self.window.popleft())
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self.window) < self.period:
+            return NAN
+        return self.total / self.period
+
+    def copy(self) -> "RollingMean":
+        clone = copy.copy(self)
+        clone.window = deque(self.window)
+        return clone
+
+
+class EMA:
+    """Exponential moving average, same recursion as pandas ewm(span, adjust=False)"""
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1.0)
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        if math.isnan(self.value):
+            self.value = value
+        elif self.value != value:
+            old_wt = 1.0 - self.alpha
+            self.value = (old_wt * self.value + self.alpha * value) / (old_wt + self.alpha)
+        return self.value
+
+    def copy(self) -> "EMA":
+        return copy.copy(self)
+
+
+class ATR:
+    """Average True Range as used by the screener (rolling mean of the true range)"""
+
+    def __init__(self, period: int):
+        self.mean = RollingMean(period)
+        self.prev_close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if not math.isnan(self.prev_close):
+            tr = max(tr, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        return self.mean.update(tr)
+
+    @property
+    def value(self) -> float:
+        return self.mean.value
+
+    def copy(self) -> "ATR":
+        clone = copy.copy(self)
+        clone.mean = self.mean.copy()
+        return clone
+
+
+class ParabolicSAR:
+    """Parabolic SAR carrying af/ep/trend state, same rules as indicators.parabolic_sar"""
+
+    def __init__(self, af_start: float = 0.02, af_increment: float = 0.02, af_max: float = 0.2):
+        self.af_start = af_start
+        self.af_increment = af_increment
+        self.af_max = af_max
+        self.value = NAN
+        self.trend = 1
+        self.af = af_start
+        self.ep = NAN
+        self.lows = deque(maxlen=2)
+        self.highs = deque(maxlen=2)
+
+    def update(self, high: float, low: float) -> float:
+        if math.isnan(self.value):
+            # Initialize on the first candle
+            self.value = low
+            self.trend = 1
+            self.af = self.af_start
+            self.ep = high
+        else:
+            current = self.value + self.af * (self.ep - self.value)
+
+            if self.trend == 1:  # Uptrend
+                current = min(current, *self.lows)
+                if low <= current:
+                    self.trend = -1
+                    current = self.ep
+                    self.ep = low
+                    self.af = self.af_start
+                elif high > self.ep:
+                    self.ep = high
+                    self.af = min(self.af + self.af_increment, self.af_max)
+            else:  # Downtrend
+                current = max(current, *self.highs)
+                if high >= current:
+                    self.trend = 1
+                    current = self.ep
+                    self.ep = high
+                    self.af = self.af_start
+                elif low < self.ep:
+                    self.ep = low
+                    self.af = min(self.af + self.af_increment, self.af_max)
+
+            self.value = current
+
+        self.lows.appendleft(low)
+        self.highs.appendleft(high)
+        return self.value
+
+    def copy(self) -> "ParabolicSAR":
+        clone = copy.copy(self)
+        clone.lows = deque(self.lows, maxlen=2)
+        clone.highs = deque(self.highs, maxlen=2)
+        return clone
+
+
+class SuperTrendMA:
+    """SuperTrended moving average with ratcheting bands, same rules as indicators.supertrend_bands"""
+
+    def __init__(self, ma_type: str = "EMA", ma_length: int = 100,
+                 atr_period: int = 10, atr_multiplier: float = 0.5):
+        self.ma = RollingMean(ma_length) if ma_type == "SMA" else EMA(ma_length)
+        self.atr = ATR(atr_period)
+        self.atr_multiplier = atr_multiplier
+        self.trend = 1
+        self.up_band = NAN
+        self.dn_band = NAN
+        self.raw_up = NAN
+        self.raw_dn = NAN
+        self.prev_close = NAN
+        self.bars = 0
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        ma = self.ma.update(close)
+        atr = self.atr.update(high, low, close)
+        up = ma - self.atr_multiplier * atr
+        dn = ma + self.atr_multiplier * atr
+
+        if self.bars > 0:
+            # Update up band
+            if not math.isnan(up) and not math.isnan(self.raw_up):
+                if math.isnan(self.up_band) or self.prev_close > self.up_band:
+                    self.up_band = up if math.isnan(self.up_band) else max(up, self.up_band)
+                else:
+                    self.up_band = up
+            elif not math.isnan(up):
+                self.up_band = up
+
+            # Update down band
+            if not math.isnan(dn) and not math.isnan(self.raw_dn):
+                if math.isnan(self.dn_band) or self.prev_close < self.dn_band:
+                    self.dn_band = dn if math.isnan(self.dn_band) else min(dn, self.dn_band)
+                else:
+                    self.dn_band = dn
+            elif not math.isnan(dn):
+                self.dn_band = dn
+
+            # Determine trend
+            if self.trend == -1:
+                self.trend = 1 if close > self.dn_band else -1
+            else:
+                self.trend = -1 if close < self.up_band else 1
+
+        self.raw_up = up
+        self.raw_dn = dn
+        self.prev_close = close
+        self.bars += 1
+        return self.values(ma)
+
+    def values(self, ma: float = None) -> Dict[str, float]:
+        return {
+            'trend': self.trend,
+            'up_band': self.up_band,
+            'dn_band': self.dn_band,
+            'ma': self.ma.value if ma is None else ma
+        }
+
+    def copy(self) -> "SuperTrendMA":
+        clone = copy.copy(self)
+        clone.ma = self.ma.copy()
+        clone.atr = self.atr.copy()
+        return clone
+
+
+# ===============================
+# STRATEGY STATE
+# ===============================
+
+class SarSmaStream:
+    """Running SMA fast/slow + SAR for the SAR + SMA strategy"""
+
+    def __init__(self, config: Dict):
+        self.sma_fast = RollingMean(config["sma_fast"])
+        self.sma_slow = RollingMean(config["sma_slow"])
+        self.sar = ParabolicSAR(config["sar_start"], config["sar_increment"], config["sar_max"])
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        return {
+            'sma_20': self.sma_fast.update(close),
+            'sma_40': self.sma_slow.update(close),
+            'sar': self.sar.update(high, low)
+        }
+
+    def copy(self) -> "SarSmaStream":
+        clone = copy.copy(self)
+        clone.sma_fast = self.sma_fast.copy()
+        clone.sma_slow = self.sma_slow.copy()
+        clone.sar = self.sar.copy()
+        return clone
+
+
+class SuperTrendStream:
+    """SuperTrend MA state for the SuperTrend MA strategy"""
+
+    def __init__(self, config: Dict):
+        self.supertrend = SuperTrendMA(
+            ma_type=config["ma_type"],
+            ma_length=config["ma_length"],
+            atr_period=config["atr_period"],
+            atr_multiplier=config["atr_multiplier"]
+        )
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        return self.supertrend.update(high, low, close)
+
+    def copy(self) -> "SuperTrendStream":
+        clone = copy.copy(self)
+        clone.supertrend = self.supertrend.copy()
+        return clone
+
+
+class StreamingState:
+    """
+    Indicator state for one strategy on one (symbol, market_type, timeframe)
+    Remembers the last closed candle it consumed so each candle is applied exactly once
+    """
+
+    def __init__(self, stream, params: Dict):
+        self.stream = stream
+        self.params = dict(params)
+        self.last_timestamp: Optional[int] = None
+        self.bars = 0
+        self.last_values: Optional[Dict[str, float]] = None
+        self.lock = threading.Lock()
+
+    def advance(self, timestamps, highs, lows, closes) -> bool:
+        """
+        Consume closed candles newer than the last one seen
+        Returns False when candles are missing (state must be rebuilt)
+        """
+        start = 0
+        if self.last_timestamp is not None:
+            while start < len(timestamps) and timestamps[start] <= self.last_timestamp:
+                start += 1
+            if start == 0 and len(timestamps) > 0:
+                return False
+
+        for i in range(start, len(timestamps)):
+            self.last_values = self.stream.update(highs[i], lows[i], closes[i])
+            self.last_timestamp = timestamps[i]
+            self.bars += 1
+        return True
+
+    def peek(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """Indicator values if the forming candle closed now (state is not changed)"""
+        return self.stream.copy().update(high, low, close)
@@ -0,0 +1,300 @@
+"""
+Regression tests for the NumPy indicator kernels
+The reference functions are the screener's original pandas .iloc loops, copied
+verbatim, so the kernels must reproduce them exactly (NaN warm-up included)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the parent directory to path to import indicators
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import parabolic_sar, supertrend_bands, supertrend_ma
+
+
+# ===============================
+# REFERENCE IMPLEMENTATIONS
+# ===============================
+
+def reference_supertrend_ma(df: pd.DataFrame, ma_type: str = "EMA", ma_length: int = 100,
+                            atr_period: int = 10, atr_multiplier: float = 0.5) -> dict:
+    """CryptoForexScreener.calculate_supertrend_ma before the NumPy kernel"""
+    if ma_type == "SMA":
+        ma = df['close'].rolling(window=ma_length, min_periods=ma_length).mean()
+    else:
+        ma = df['close'].ewm(span=ma_length, adjust=False).mean()
+
+    tr = pd.concat([
+        df['high'] - df['low'],
+        abs(df['high'] - df['close'].shift()),
+        abs(df['low'] - df['close'].shift())
+    ], axis=1).max(axis=1)
+    atr = tr.rolling(window=atr_period, min_periods=atr_period).mean()
+
+    up = ma - atr_multiplier * atr
+    dn = ma + atr_multiplier * atr
+
+    trend = pd.Series(1, index=df.index)
+    final_up = pd.Series(index=df.index, dtype=float)
+    final_dn = pd.Series(index=df.index, dtype=float)
+
+    for i in range(1, len(df)):
+        # Update up band
+        if pd.notna(up.iloc[i]) and pd.notna(up.iloc[i-1]):
+            if df['close'].iloc[i-1] > final_up.iloc[i-1] if pd.notna(final_up.iloc[i-1]) else True:
+                final_up.iloc[i] = max(up.iloc[i], final_up.iloc[i-1] if pd.notna(final_up.iloc[i-1]) else up.iloc[i])
+            else:
+                final_up.iloc[i] = up.iloc[i]
+        else:
+            final_up.iloc[i] = up.iloc[i] if pd.notna(up.iloc[i]) else final_up.iloc[i-1]
+
+        # Update down band
+        if pd.notna(dn.iloc[i]) and pd.notna(dn.iloc[i-1]):
+            if df['close'].iloc[i-1] < final_dn.iloc[i-1] if pd.notna(final_dn.iloc[i-1]) else True:
+                final_dn.iloc[i] = min(dn.iloc[i], final_dn.iloc[i-1] if pd.notna(final_dn.iloc[i-1]) else dn.iloc[i])
+            else:
+                final_dn.iloc[i] = dn.iloc[i]
+        else:
+            final_dn.iloc[i] = dn.iloc[i] if pd.notna(dn.iloc[i]) else final_dn.iloc[i-1]
+
+        # Determine trend
+        if i > 0:
+            if trend.iloc[i-1] == -1:
+                if df['close'].iloc[i] > final_dn.iloc[i]:
+                    trend.iloc[i] = 1
+                else:
+                    trend.iloc[i] = -1
+            else:
+                if df['close'].iloc[i] < final_up.iloc[i]:
+                    trend.iloc[i] = -1
+                else:
+                    trend.iloc[i] = 1
+
+    return {
+        'trend': trend,
+        'up_band': final_up,
+        'dn_band': final_dn,
+        'ma': ma
+    }
+
+
+def reference_parabolic_sar(high: pd.Series, low: pd.Series, af_start: float = 0.02,
+                            af_increment: float = 0.02, af_max: float = 0.2) -> tuple:
+    """CryptoForexScreener.calculate_sar before the NumPy kernel, also returning its trend"""
+    length = len(high)
+    sar = np.zeros(length)
+    trend = np.zeros(length)
+    af = np.zeros(length)
+    ep = np.zeros(length)
+
+    # Initialize
+    sar[0] = low.iloc[0]
+    trend[0] = 1
+    af[0] = af_start
+    ep[0] = high.iloc[0]
+
+    for i in range(1, length):
+        if trend[i-1] == 1:  # Uptrend
+            sar[i] = sar[i-1] + af[i-1] * (ep[i-1] - sar[i-1])
+
+            if i >= 2:
+                sar[i] = min(sar[i], low.iloc[i-1], low.iloc[i-2])
+            elif i >= 1:
+                sar[i] = min(sar[i], low.iloc[i-1])
+
+            if low.iloc[i] <= sar[i]:
+                trend[i] = -1
+                sar[i] = ep[i-1]
+                ep[i] = low.iloc[i]
+                af[i] = af_start
+            else:
+                trend[i] = 1
+                if high.iloc[i] > ep[i-1]:
+                    ep[i] = high.iloc[i]
+                    af[i] = min(af[i-1] + af_increment, af_max)
+                else:
+                    ep[i] = ep[i-1]
+                    af[i] = af[i-1]
+
+        else:  # Downtrend
+            sar[i] = sar[i-1] + af[i-1] * (ep[i-1] - sar[i-1])
+
+            if i >= 2:
+                sar[i] = max(sar[i], high.iloc[i-1], high.iloc[i-2])
+            elif i >= 1:
+                sar[i] = max(sar[i], high.iloc[i-1])
+
+            if high.iloc[i] >= sar[i]:
+                trend[i] = 1
+                sar[i] = ep[i-1]
+                ep[i] = high.iloc[i]
+                af[i] = af_start
+            else:
+                trend[i] = -1
+                if low.iloc[i] < ep[i-1]:
+                    ep[i] = low.iloc[i]
+                    af[i] = min(af[i-1] + af_increment, af_max)
+                else:
+                    ep[i] = ep[i-1]
+                    af[i] = af[i-1]
+
+    return sar, trend
+
+
+# ===============================
+# HELPERS
+# ===============================
+
+def random_ohlc(rng: np.random.Generator, n_bars: int) -> pd.DataFrame:
+    """Random-walk candles with a few flat stretches so ties and reversals happen"""
+    close = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    close[n_bars // 3:n_bars // 3 + 5] = close[n_bars // 3]
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) + rng.random(n_bars)
+    low = np.minimum(open_, close) - rng.random(n_bars)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close})
+
+
+def assert_supertrend_equal(result: dict, expected: dict):
+    """Kernel output equals the reference loop, NaN positions included"""
+    np.testing.assert_array_equal(result['trend'], expected['trend'].to_numpy())
+    np.testing.assert_array_equal(result['up_band'], expected['up_band'].to_numpy())
+    np.testing.assert_array_equal(result['dn_band'], expected['dn_band'].to_numpy())
+    np.testing.assert_array_equal(result['ma'], expected['ma'].to_numpy())
+
+
+SUPERTREND_PARAMS = [
+    ("EMA", 100, 10, 0.5),
+    ("SMA", 100, 10, 0.5),
+    ("EMA", 20, 14, 1.5),
+    ("SMA", 50, 5, 3.0),
+]
+
+
+# ===============================
+# SUPERTREND MA
+# ===============================
+
+@pytest.mark.parametrize("ma_type,ma_length,atr_period,atr_multiplier", SUPERTREND_PARAMS)
+def test_supertrend_ma_matches_reference_1d(ma_type, ma_length, atr_period, atr_multiplier):
+    rng = np.random.default_rng(1)
+    for n_bars in (1, 2, 60, 150, 300):
+        df = random_ohlc(rng, n_bars)
+        result = supertrend_ma(
+            df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(),
+            ma_type=ma_type, ma_length=ma_length, atr_period=atr_period, atr_multiplier=atr_multiplier
+        )
+        expected = reference_supertrend_ma(df, ma_type, ma_length, atr_period, atr_multiplier)
+        assert_supertrend_equal(result, expected)
+
+
+@pytest.mark.parametrize("ma_type,ma_length,atr_period,atr_multiplier", SUPERTREND_PARAMS)
+def test_supertrend_ma_matches_reference_2d(ma_type, ma_length, atr_period, atr_multiplier):
+    rng = np.random.default_rng(2)
+    frames = [random_ohlc(rng, 200) for _ in range(12)]
+    result = supertrend_ma(
+        np.stack([df['high'].to_numpy() for df in frames]),
+        np.stack([df['low'].to_numpy() for df in frames]),
+        np.stack([df['close'].to_numpy() for df in frames]),
+        ma_type=ma_type, ma_length=ma_length, atr_period=atr_period, atr_multiplier=atr_multiplier
+    )
+    assert result['trend'].shape == (12, 200)
+
+    for row, df in enumerate(frames):
+        expected = reference_supertrend_ma(df, ma_type, ma_length, atr_period, atr_multiplier)
+        assert_supertrend_equal({key: values[row] for key, values in result.items()}, expected)
+
+
+def test_supertrend_bands_with_nan_gaps():
+    """Raw bands with NaN warm-up and gaps in the middle ratchet like the reference"""
+    rng = np.random.default_rng(3)
+    df = random_ohlc(rng, 120)
+    close = df['close'].to_numpy()
+    up = close - rng.random(120) * 2
+    dn = close + rng.random(120) * 2
+    up[:15] = np.nan
+    dn[:15] = np.nan
+    up[50:53] = np.nan
+    dn[70] = np.nan
+
+    trend, final_up, final_dn = supertrend_bands(close, up, dn)
+
+    # Drive the reference loop with the same raw bands (MA = close, ATR folded into the bands)
+    expected_up = pd.Series(np.nan, index=df.index)
+    expected_dn = pd.Series(np.nan, index=df.index)
+    expected_trend = pd.Series(1, index=df.index)
+    up_s, dn_s, close_s = pd.Series(up), pd.Series(dn), df['close']
+    for i in range(1, len(df)):
+        if pd.notna(up_s.iloc[i]) and pd.notna(up_s.iloc[i-1]):
+            if close_s.iloc[i-1] > expected_up.iloc[i-1] if pd.notna(expected_up.iloc[i-1]) else True:
+                expected_up.iloc[i] = max(up_s.iloc[i], expected_up.iloc[i-1] if pd.notna(expected_up.iloc[i-1]) else up_s.iloc[i])
+            else:
+                expected_up.iloc[i] = up_s.iloc[i]
+        else:
+            expected_up.iloc[i] = up_s.iloc[i] if pd.notna(up_s.iloc[i]) else expected_up.iloc[i-1]
+
+        if pd.notna(dn_s.iloc[i]) and pd.notna(dn_s.iloc[i-1]):
+            if close_s.iloc[i-1] < expected_dn.iloc[i-1] if pd.notna(expected_dn.iloc[i-1]) else True:
+                expected_dn.iloc[i] = min(dn_s.iloc[i], expected_dn.iloc[i-1] if pd.notna(expected_dn.iloc[i-1]) else dn_s.iloc[i])
+            else:
+                expected_dn.iloc[i] = dn_s.iloc[i]
+        else:
+            expected_dn.iloc[i] = dn_s.iloc[i] if pd.notna(dn_s.iloc[i]) else expected_dn.iloc[i-1]
+
+        if expected_trend.iloc[i-1] == -1:
+            expected_trend.iloc[i] = 1 if close_s.iloc[i] > expected_dn.iloc[i] else -1
+        else:
+            expected_trend.iloc[i] = -1 if close_s.iloc[i] < expected_up.iloc[i] else 1
+
+    np.testing.assert_array_equal(trend, expected_trend.to_numpy())
+    np.testing.assert_array_equal(final_up, expected_up.to_numpy())
+    np.testing.assert_array_equal(final_dn, expected_dn.to_numpy())
+
+
+# ===============================
+# PARABOLIC SAR
+# ===============================
+
+SAR_PARAMS = [
+    (0.02, 0.02, 0.2),
+    (0.01, 0.01, 0.1),
+    (0.05, 0.03, 0.3),
+]
+
+
+@pytest.mark.parametrize("af_start,af_increment,af_max", SAR_PARAMS)
+def test_parabolic_sar_matches_reference_1d(af_start, af_increment, af_max):
+    rng = np.random.default_rng(4)
+    for n_bars in (1, 2, 3, 100, 300):
+        df = random_ohlc(rng, n_bars)
+        sar, trend = parabolic_sar(df['high'].to_numpy(), df['low'].to_numpy(), af_start, af_increment, af_max)
+        expected_sar, expected_trend = reference_parabolic_sar(df['high'], df['low'], af_start, af_increment, af_max)
+        np.testing.assert_array_equal(sar, expected_sar)
+        np.testing.assert_array_equal(trend, expected_trend)
+
+
+@pytest.mark.parametrize("af_start,af_increment,af_max", SAR_PARAMS)
+def test_parabolic_sar_matches_reference_2d(af_start, af_increment, af_max):
+    rng = np.random.default_rng(5)
+    frames = [random_ohlc(rng, 250) for _ in range(12)]
+    sar, trend = parabolic_sar(
+        np.stack([df['high'].to_numpy() for df in frames]),
+        np.stack([df['low'].to_numpy() for df in frames]),
+        af_start, af_increment, af_max
+    )
+    assert sar.shape == (12, 250)
+
+    for row, df in enumerate(frames):
+        expected_sar, expected_trend = reference_parabolic_sar(df['high'], df['low'], af_start, af_increment, af_max)
+        np.testing.assert_array_equal(sar[row], expected_sar)
+        np.testing.assert_array_equal(trend[row], expected_trend)
+
+
+def test_parabolic_sar_empty():
+    sar, trend = parabolic_sar(np.array([]), np.array([]))
+    assert sar.shape == (0,) and trend.shape == (0,)
@@ -0,0 +1,65 @@
+"""
+Ticker Snapshot - a Binance /ticker/24hr payload parsed once into columns
+Top-coin selection and price lookups read numpy arrays instead of converting
+the same strings with float() for every row on every scan
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class TickerSnapshot:
+    """
+    Columnar view of one /ticker/24hr response
+    Rows keep the payload order; index maps symbol -> row
+    """
+
+    def __init__(self, tickers: List[Dict], fetched_at: Optional[float] = None):
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.symbols = [t["symbol"] for t in tickers]
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+        # numpy parses the decimal strings in one pass per column
+        self.last_price = np.array([t["lastPrice"] for t in tickers], dtype=np.float64)
+        self.price_change = np.array([t["priceChange"] for t in tickers], dtype=np.float64)
+        self.price_change_percent = np.array([t["priceChangePercent"] for t in tickers], dtype=np.float64)
+        self.quote_volume = np.array([t["quoteVolume"] for t in tickers], dtype=np.float64)
+        self.high = np.array([t["highPrice"] for t in tickers], dtype=np.float64)
+        self.low = np.array([t["lowPrice"] for t in tickers], dtype=np.float64)
+        self.close_time = np.array([t["closeTime"] for t in tickers], dtype=np.int64)
+        self.usdt = np.array([symbol.endswith("USDT") for symbol in self.symbols], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    @property
+    def age(self) -> float:
+        """Seconds since the payload was fetched"""
+        return time.time() - self.fetched_at
+
+    def top_usdt(self, limit: int, min_volume: float) -> List[str]:
+        """USDT pairs above min_volume, highest quote volume first (ties keep payload order)"""
+        rows = np.flatnonzero(self.usdt & (self.quote_volume > min_volume))
+        order = rows[np.argsort(-self.quote_volume[rows], kind="stable")]
+        return [self.symbols[row] for row in order[:limit]]
+
+    def row(self, symbol: str) -> Optional[Dict]:
+        """24h figures for one symbol, named like the MarketData fields"""
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        return {
+            "symbol": symbol,
+            "price": float(self.last_price[row]),
+            "price_change_24h": float(self.price_change[row]),
+            "price_change_percent_24h": float(self.price_change_percent[row]),
+            "volume_24h": float(self.quote_volume[row]),
+            "high_24h": float(self.high[row]),
+            "low_24h": float(self.low[row]),
+            "last_update_time": int(self.close_time[row])
+        }